@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark a flash-sale spike on POST /api/bookings/book.
+
+Seeds one session and as many users as there are requests, then fires all
+bookings for that session at once from a pool of threads, first with the
+admission queue disabled and then enabled. Reports the status codes and
+latency of each run. Exits non-zero if the admission run overbooks the
+session, fails with server errors, or sends a 429 without Retry-After.
+
+Usage: python benchmark_admission.py [requests] [capacity]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# A throwaway database file, so concurrent writers contend like in production
+os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+# Keep CRM notifications from waiting on a service that is not running
+os.environ['CRM_BASE_URL'] = 'http://127.0.0.1:9'
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+from main_app.app import create_app
+from main_app.models import db
+from main_app.models.user import User
+from main_app.models.event import Event
+from main_app.models.session import Session
+from main_app.routes.auth_service import AuthService
+from main_app.utils.admission import admission
+
+
+def seed(requests, capacity):
+    """Create a session with `capacity` seats and a token for each of `requests` users"""
+    db.drop_all()
+    db.create_all()
+
+    now = datetime.utcnow()
+    facilitator = User(name='Spike Facilitator', email='facilitator@example.com', password='x', role='facilitator')
+    event = Event(title='Flash sale', description='Seeded event',
+                  start_date=now + timedelta(days=1), end_date=now + timedelta(days=2))
+    users = [User(name=f'Spike User {i}', email=f'user{i}@example.com', password='x', role='user')
+             for i in range(requests)]
+    db.session.add_all([facilitator, event] + users)
+    db.session.flush()
+    session = Session(event_id=event.id, facilitator_id=facilitator.id, time=now + timedelta(days=1),
+                      location='Main Hall', capacity=capacity)
+    db.session.add(session)
+    db.session.commit()
+    return session.id, [AuthService.generate_jwt(user.id, role='user') for user in users]
+
+
+def spike(app, session_id, tokens):
+    """Send every booking at once; returns (status, seconds, response) per request"""
+    def book(token):
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.post('/api/bookings/book', json={'session_id': session_id},
+                               headers={'Authorization': f'Bearer {token}'})
+        return response.status_code, time.perf_counter() - started, response
+
+    with ThreadPoolExecutor(max_workers=len(tokens)) as pool:
+        return list(pool.map(book, tokens))
+
+
+def report(label, results):
+    """Print status counts and latency percentiles of one run"""
+    statuses = Counter(status for status, _, _ in results)
+    timings = sorted(seconds for _, seconds, _ in results)
+    print(f"\n{label}")
+    print(f"   statuses {dict(sorted(statuses.items()))}")
+    print(f"   median {timings[len(timings) // 2] * 1000:7.1f} ms")
+    print(f"   p99    {timings[int(len(timings) * 0.99)] * 1000:7.1f} ms")
+    return statuses
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    capacity = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print(f"Benchmarking {requests} simultaneous bookings for {capacity} seats...")
+    print("=" * 50)
+
+    app = create_app()
+    # The CRM is unreachable on purpose; keep its connection errors out of the report
+    logging.disable(logging.ERROR)
+    failures = []
+    for label, enabled in (('Without admission queue', False), ('With admission queue', True)):
+        with app.app_context():
+            session_id, tokens = seed(requests, capacity)
+        rate = app.config['ADMISSION_RATE'] if enabled else 0
+        admission.configure(rate, app.config['ADMISSION_BURST'],
+                            app.config['ADMISSION_QUEUE_SIZE'], app.config['ADMISSION_MAX_WAIT'])
+
+        results = spike(app, session_id, tokens)
+        statuses = report(label, results)
+
+        with app.app_context():
+            booked = db.session.get(Session, session_id).booked_count
+        print(f"   booked {booked}/{capacity} seats")
+
+        if enabled:
+            if booked > capacity:
+                failures.append("session was overbooked")
+            if statuses.get(500):
+                failures.append(f"{statuses[500]} requests failed with 500")
+            if any(status == 429 and 'Retry-After' not in response.headers for status, _, response in results):
+                failures.append("429 sent without Retry-After")
+
+    if failures:
+        for failure in failures:
+            print(f"\n❌ {failure}")
+        sys.exit(1)
+    print("\n🎉 Spike was queued per session and the overflow got fast 429s")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding of large list responses.
+
+Builds get_sessions and get_my_bookings payloads from an in-memory database
+and times three ways of encoding them:
+
+- old:    models format every datetime with isoformat() and Flask's default
+          provider encodes the result with sorted keys
+- stdlib: models return raw datetimes, IsoJSONProvider (no orjson) encodes
+- orjson: models return raw datetimes, OrjsonProvider encodes
+
+Usage: python benchmark_json.py [rows] [repeats]
+"""
+
+import os
+import sys
+import timeit
+
+# Always run against a throwaway in-memory database
+os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+from flask.json.provider import DefaultJSONProvider
+from main_app.app import create_app
+from main_app.models import db
+from main_app.models.user import User
+from main_app.models.event import Event
+from main_app.models.session import Session
+from main_app.models.booking import Booking, BookingStatus
+from main_app.utils.json_provider import IsoJSONProvider, OrjsonProvider, orjson
+
+
+def seed(rows):
+    """Create one event with `rows` sessions, each booked once by the same user"""
+    db.drop_all()
+    db.create_all()
+
+    facilitator = User(name='Facilitator', email='facilitator@example.com', password='x', role='facilitator')
+    user = User(name='Benchmark User', email='user@example.com', password='x', role='user')
+    db.session.add_all([facilitator, user])
+    db.session.flush()
+
+    now = datetime.utcnow()
+    ev = Event(title='Benchmark Event', description='Seeded event',
+               start_date=now, end_date=now + timedelta(days=30))
+    db.session.add(ev)
+    db.session.flush()
+
+    for i in range(rows):
+        session = Session(event_id=ev.id, facilitator_id=facilitator.id, capacity=50, booked_count=1,
+                          time=now + timedelta(hours=i), location=f'Room {i % 20}')
+        db.session.add(session)
+        db.session.flush()
+        db.session.add(Booking(user_id=user.id, session_id=session.id,
+                               status=BookingStatus.BOOKED.value, timestamp=now))
+
+    db.session.commit()
+
+
+def payloads():
+    """Response bodies as the list endpoints build them, with raw datetimes"""
+    pagination = {'per_page': 0, 'total': 0, 'has_next': False, 'next_cursor': None}
+    return {
+        'get_sessions': {
+            'sessions': [s.to_dict() for s in Session.query.all()],
+            'pagination': pagination
+        },
+        'get_my_bookings': {
+            'bookings': [b.to_dict() for b in Booking.query.all()],
+            'pagination': pagination
+        },
+    }
+
+
+def isoformat_values(obj):
+    """Format datetimes the way the models used to, field by field"""
+    if isinstance(obj, dict):
+        return {k: isoformat_values(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [isoformat_values(v) for v in obj]
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return obj
+
+
+def benchmark(app, rows, repeats):
+    """Time every encoder on every payload and print the results"""
+    old = DefaultJSONProvider(app)
+    stdlib = IsoJSONProvider(app)
+    fast = OrjsonProvider(app) if orjson is not None else None
+
+    for name, payload in payloads().items():
+        size = len(fast.dumps(payload) if fast else stdlib.dumps(payload))
+        print(f"\n{name}: {rows} rows, {size / 1024:.0f} KiB")
+
+        encoders = [
+            ('old', lambda: old.dumps(isoformat_values(payload))),
+            ('stdlib', lambda: stdlib.dumps(payload)),
+        ]
+        if fast:
+            encoders.append(('orjson', lambda: fast.response(payload).get_data()))
+
+        baseline = None
+        for label, encode in encoders:
+            seconds = min(timeit.repeat(encode, number=1, repeat=repeats))
+            baseline = baseline or seconds
+            print(f"   {label:<7} {seconds * 1000:8.2f} ms   {baseline / seconds:5.1f}x")
+
+    if not fast:
+        print("\n⚠️  orjson is not installed; only the standard library encoders were timed")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print("Benchmarking JSON encoding...")
+    print("=" * 50)
+
+    app = create_app()
+    with app.app_context(), app.test_request_context():
+        seed(rows)
+        benchmark(app, rows, repeats)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark ORM hydration against column projections for list pages.
+
+Builds one page of get_sessions, get_events and get_registered_users data
+both ways - loading ORM objects and calling to_dict(), and running the
+read-only list_select() projections - and reports time and peak memory
+per page.
+
+Usage: python benchmark_projections.py [page_size] [repeats]
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+# Always run against a throwaway in-memory database
+os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+from sqlalchemy import desc
+from main_app.app import create_app
+from main_app.models import db
+from main_app.models.user import User
+from main_app.models.event import Event
+from main_app.models.session import Session
+from main_app.utils.loading import with_loads, session_loads
+
+
+def seed(rows):
+    """Create `rows` users and events, and `rows` sessions spread across them"""
+    db.drop_all()
+    db.create_all()
+
+    now = datetime.utcnow()
+    users = [User(name=f'User {i}', email=f'user{i}@example.com', password='x',
+                  role='facilitator' if i % 10 == 0 else 'user') for i in range(rows)]
+    events = [Event(title=f'Event {i}', description='Seeded event',
+                    start_date=now + timedelta(days=i), end_date=now + timedelta(days=i + 1)) for i in range(rows)]
+    db.session.add_all(users + events)
+    db.session.flush()
+
+    facilitators = [u for u in users if u.role == 'facilitator']
+    for i in range(rows):
+        db.session.add(Session(event_id=events[i % len(events)].id, facilitator_id=facilitators[i % len(facilitators)].id,
+                               time=now + timedelta(hours=i), location=f'Room {i % 20}', capacity=30))
+    db.session.commit()
+
+
+def orm_pages(page_size):
+    """Page builders that hydrate ORM objects, as the endpoints used to"""
+    def sessions():
+        query = with_loads(Session.query, *session_loads()).order_by(desc(Session.time), desc(Session.id))
+        return [s.to_dict() for s in query.limit(page_size).all()]
+
+    def events():
+        events = Event.query.order_by(desc(Event.start_date), desc(Event.id)).limit(page_size).all()
+        return [e.to_dict(len(e.sessions), sum(s.booked_count for s in e.sessions)) for e in events]
+
+    def users():
+        query = User.query.order_by(desc(User.created_at), desc(User.id))
+        return [u.to_dict() for u in query.limit(page_size).all()]
+
+    return {'get_sessions': sessions, 'get_events': events, 'get_registered_users': users}
+
+
+def projection_pages(page_size):
+    """Page builders using the read-only list_select() projections"""
+    def sessions():
+        stmt = Session.list_select().order_by(desc(Session.time), desc(Session.id)).limit(page_size)
+        return [Session.row_to_dict(row) for row in db.session.execute(stmt)]
+
+    def events():
+        stmt = Event.list_select().order_by(desc(Event.start_date), desc(Event.id)).limit(page_size)
+        return [row._asdict() for row in db.session.execute(stmt)]
+
+    def users():
+        stmt = User.list_select().order_by(desc(User.created_at), desc(User.id)).limit(page_size)
+        return [row._asdict() for row in db.session.execute(stmt)]
+
+    return {'get_sessions': sessions, 'get_events': events, 'get_registered_users': users}
+
+
+def measure(build, repeats):
+    """Return (best seconds, peak bytes) for building one page"""
+    def run():
+        build()
+        # Endpoints start each request with an empty identity map
+        db.session.expunge_all()
+
+    seconds = min(timeit.repeat(run, number=1, repeat=repeats))
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+if __name__ == "__main__":
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print(f"Benchmarking {page_size}-row list pages...")
+    print("=" * 50)
+
+    app = create_app()
+    with app.app_context():
+        seed(page_size * 2)
+        orm, projection = orm_pages(page_size), projection_pages(page_size)
+        for name in orm:
+            orm_time, orm_peak = measure(orm[name], repeats)
+            proj_time, proj_peak = measure(projection[name], repeats)
+            print(f"\n{name}")
+            print(f"   orm         {orm_time * 1000:7.2f} ms   {orm_peak / 1024:7.0f} KiB peak")
+            print(f"   projection  {proj_time * 1000:7.2f} ms   {proj_peak / 1024:7.0f} KiB peak"
+                  f"   ({orm_time / proj_time:.1f}x faster, {orm_peak / proj_peak:.1f}x less memory)")
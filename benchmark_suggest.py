@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/suggest lookups against the in-memory prefix index.
+
+Seeds events, sessions and facilitators, builds the suggestion index and
+times lookups for one- to four-letter prefixes, reporting median and p99
+latency. Exits non-zero if the p99 lookup takes a millisecond or more.
+
+Usage: python benchmark_suggest.py [rows] [lookups]
+"""
+
+import os
+import random
+import sys
+import time
+
+# Always run against a throwaway in-memory database
+os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+from main_app.app import create_app
+from main_app.models import db
+from main_app.models.user import User
+from main_app.models.event import Event
+from main_app.models.session import Session
+from main_app.utils.suggest import suggest_index
+
+WORDS = ['yoga', 'pottery', 'conference', 'retreat', 'workshop', 'meditation', 'running', 'painting',
+         'coding', 'writing', 'cooking', 'dance', 'music', 'garden', 'hall', 'studio', 'room', 'annex']
+
+
+def seed(rows):
+    """Create `rows` events and sessions and a facilitator for every ten of them"""
+    db.drop_all()
+    db.create_all()
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    facilitators = [User(name=f'{rng.choice(WORDS).title()} Facilitator {i}', email=f'facilitator{i}@example.com',
+                         password='x', role='facilitator') for i in range(max(rows // 10, 1))]
+    events = [Event(title=f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}', description='Seeded event',
+                    start_date=now + timedelta(days=i), end_date=now + timedelta(days=i + 1)) for i in range(rows)]
+    db.session.add_all(facilitators + events)
+    db.session.flush()
+    for i in range(rows):
+        db.session.add(Session(event_id=events[i].id, facilitator_id=facilitators[i % len(facilitators)].id,
+                               time=now + timedelta(hours=i), location=f'{rng.choice(WORDS).title()} {i % 50}'))
+    db.session.commit()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    print(f"Benchmarking suggestions over {rows} events and sessions...")
+    print("=" * 50)
+
+    app = create_app()
+    with app.app_context():
+        seed(rows)
+
+        started = time.perf_counter()
+        suggest_index.refresh()
+        print(f"Index built in {(time.perf_counter() - started) * 1000:.0f} ms ({len(suggest_index)} texts)")
+
+        rng = random.Random(7)
+        prefixes = [rng.choice(WORDS)[:rng.randint(1, 4)] for _ in range(lookups)]
+        timings = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            suggest_index.suggest(prefix, app.config['SUGGEST_LIMIT'])
+            timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    median = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f"\n   median {median:7.1f} us")
+    print(f"   p99    {p99:7.1f} us")
+
+    if p99 >= 1000:
+        print("\n❌ p99 lookup is over a millisecond")
+        sys.exit(1)
+    print("\n🎉 Lookups stay well under a millisecond")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Check that the list endpoints run a constant number of queries.
+
+Seeds an in-memory database with a growing number of events, sessions and
+bookings, calls each list endpoint and counts the SQL statements it issues.
+Runs with SQLALCHEMY_RAISE_ON_LAZY_LOAD enabled, so a relationship an
+endpoint forgot to eager-load fails the request instead of adding a query
+per row. Exits non-zero if any endpoint errors, its count grows with the
+data (an N+1 regression), or it issues more queries than its budget.
+"""
+
+import os
+import sys
+
+# Always run against a throwaway in-memory database, with lazy loads raising
+os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+os.environ['SQLALCHEMY_RAISE_ON_LAZY_LOAD'] = 'true'
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from main_app.app import create_app
+from main_app.models import db
+from main_app.models.user import User
+from main_app.models.event import Event
+from main_app.models.session import Session
+from main_app.models.booking import Booking, BookingStatus
+from main_app.routes.auth_service import AuthService
+from main_app.utils.cache import ttl_cache
+from main_app.utils.response_cache import response_cache
+
+# Data set sizes as (events, sessions per event, booking users)
+SIZES = [(1, 1, 1), (5, 5, 3), (10, 20, 6)]
+
+
+def seed(n_events, n_sessions, n_users):
+    """
+    Create two facilitators taking turns running sessions and n_users users
+    who each book every other session
+
+    Returns:
+        dict: ids used to build the endpoint URLs
+    """
+    db.drop_all()
+    db.create_all()
+    # Start every data set with cold caches so the counts are comparable
+    ttl_cache.clear()
+    response_cache.clear()
+
+    facilitators = [
+        User(name=f'Facilitator {i}', email=f'facilitator{i}@example.com', password='x', role='facilitator')
+        for i in range(2)
+    ]
+    users = [
+        User(name=f'User {i}', email=f'user{i}@example.com', password='x', role='user')
+        for i in range(n_users)
+    ]
+    db.session.add_all(facilitators + users)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    for i in range(n_events):
+        ev = Event(title=f'Event {i}', description='Seeded event',
+                   start_date=now + timedelta(days=i + 1), end_date=now + timedelta(days=i + 2))
+        db.session.add(ev)
+        db.session.flush()
+        for j in range(n_sessions):
+            session = Session(event_id=ev.id, facilitator_id=facilitators[j % 2].id,
+                              time=ev.start_date + timedelta(hours=j), location=f'Room {j}')
+            db.session.add(session)
+            db.session.flush()
+            if j % 2 == 0:
+                for user in users:
+                    db.session.add(Booking(user_id=user.id, session_id=session.id,
+                                           status=BookingStatus.BOOKED.value, timestamp=now))
+                session.booked_count = len(users)
+
+    db.session.commit()
+    return {
+        'user_id': users[0].id,
+        'facilitator_id': facilitators[0].id,
+        'event_id': db.session.query(db.func.min(Event.id)).scalar(),
+        'session_id': db.session.query(db.func.min(Session.id)).filter(
+            Session.facilitator_id == facilitators[0].id
+        ).scalar(),
+    }
+
+
+def endpoints(ids):
+    """
+    List endpoints to check, as (name, url, id of the calling user, query budget)
+
+    Paginated lists budget one validator query, the total count and the
+    page; detail views replace the count with their eager loads.
+    """
+    user, facilitator = ids['user_id'], ids['facilitator_id']
+    return [
+        ('events catalog', '/api/events?per_page=50', user, 3),
+        # Plus the page's sessions with the user's bookings
+        ('dashboard events', '/api/dashboard/events?per_page=50', user, 4),
+        ('my bookings', '/api/bookings/my-bookings?per_page=50', user, 3),
+        ('sessions', '/api/sessions?per_page=50', user, 3),
+        # Validators, event, its sessions, their facilitators
+        ('event detail', f"/api/events/{ids['event_id']}", user, 4),
+        ('event sessions', f"/api/events/{ids['event_id']}/sessions", user, 4),
+        ('facilitator my sessions', '/api/facilitator/my-sessions?per_page=50', facilitator, 3),
+        # Ownership check, validators, bookings
+        ('facilitator session bookings', f"/api/facilitator/sessions/{ids['session_id']}/bookings", facilitator, 3),
+        # Validators, summary aggregate, user count, recent sessions
+        ('facilitator dashboard', '/api/facilitator/dashboard', facilitator, 4),
+        ('facilitator users', '/api/facilitator/users?per_page=50', facilitator, 3),
+    ]
+
+
+def count_queries(app, client, url, user_id):
+    """Call an endpoint and return (status code, number of SQL statements)"""
+    with app.app_context():
+        # Tokens carry the role claim, as issued by /auth/login
+        token = AuthService.generate_jwt(user_id, role=db.session.get(User, user_id).role)
+        engine = db.engine
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url, headers={'Authorization': f'Bearer {token}'})
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    return response.status_code, len(statements)
+
+
+def check_list_queries():
+    """Run every endpoint against growing data sets and compare query counts"""
+    app = create_app()
+    client = app.test_client()
+    counts = {}
+    budgets = {}
+    failures = []
+
+    for n_events, n_sessions, n_users in SIZES:
+        with app.app_context():
+            ids = seed(n_events, n_sessions, n_users)
+        for name, url, user_id, budget in endpoints(ids):
+            status, queries = count_queries(app, client, url, user_id)
+            counts.setdefault(name, []).append(queries)
+            budgets[name] = budget
+            if status != 200 and name not in failures:
+                print(f"❌ {name}: HTTP {status} with {n_events} events x {n_sessions} sessions")
+                failures.append(name)
+
+    for name, queries in counts.items():
+        if name in failures:
+            continue
+        if len(set(queries)) != 1:
+            print(f"❌ {name}: {' -> '.join(map(str, queries))} queries as the data grows")
+            failures.append(name)
+        elif queries[0] > budgets[name]:
+            print(f"❌ {name}: {queries[0]} queries, budget is {budgets[name]}")
+            failures.append(name)
+        else:
+            print(f"✅ {name}: {queries[0]} queries (budget {budgets[name]})")
+
+    return failures
+
+
+if __name__ == "__main__":
+    print("Checking list endpoint query counts...")
+    print("=" * 50)
+
+    failures = check_list_queries()
+    if failures:
+        print(f"\n❌ {len(failures)} endpoints issue a query per row, exceed their budget or fail to load")
+        sys.exit(1)
+
+    print("\n🎉 Query counts are constant and within budget")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Check that the hot route queries are served by indexes.
+
+Runs EXPLAIN QUERY PLAN for the lookups used by the booking, event and
+facilitator routes and exits non-zero if any of them SCANs a table or an
+index (anything other than a SEARCH step), unless it is listed in
+INTENDED_SCANS with the reason. An intended scan must still be an ordered
+index walk, without a temporary B-tree sorting its rows. By default the check runs against a fresh in-memory database
+built from the models; set SQLALCHEMY_DATABASE_URI to check a migrated one.
+"""
+
+import os
+import sys
+
+# Use an in-memory database unless one is given explicitly
+os.environ.setdefault('SQLALCHEMY_DATABASE_URI', 'sqlite://')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+from sqlalchemy import desc
+from main_app.app import create_app
+from main_app.models import db
+from main_app.models.booking import Booking, BookingStatus
+from main_app.models.session import Session
+from main_app.models.user import User
+from main_app.models.event import Event
+from main_app.models.waitlist import Waitlist
+from main_app.models.hold import SeatHold
+
+
+def route_queries():
+    """Queries issued by the routes, keyed by a short description"""
+    now = datetime.utcnow()
+    booked = BookingStatus.BOOKED.value
+    cancelled = BookingStatus.CANCELLED.value
+
+    return {
+        # booking_routes
+        'reactivate_booking: active booking lookup':
+            Booking.query.filter_by(user_id=1, session_id=1, status=booked),
+        'Booking.upsert_active: cancelled booking lookup':
+            Booking.query.filter_by(user_id=1, session_id=1, status=cancelled),
+        'get_my_bookings':
+            Booking.query.filter_by(user_id=1).order_by(desc(Booking.timestamp)),
+        'get_my_bookings: status filter':
+            Booking.query.filter_by(user_id=1, status=booked).order_by(desc(Booking.timestamp)),
+        'Booking.count_session_bookings':
+            Booking.query.filter_by(session_id=1, status=booked),
+        'Waitlist.join: next position':
+            db.select(db.func.max(Waitlist.position)).where(Waitlist.session_id == 1),
+        'Waitlist.promote: head of queue':
+            Waitlist.query.filter_by(session_id=1).order_by(Waitlist.position).limit(2),
+        'SeatHold.expired_batch':
+            db.select(SeatHold.id, SeatHold.session_id).where(SeatHold.expires_at <= now)
+            .order_by(SeatHold.expires_at).limit(500),
+        'book_seat: hold conversion':
+            db.delete(SeatHold).where(SeatHold.user_id == 1, SeatHold.session_id == 1),
+        'Waitlist.place':
+            db.select(db.func.count()).select_from(Waitlist).where(Waitlist.session_id == 1, Waitlist.position < 5),
+
+        # facilitator_routes
+        'get_my_sessions':
+            Session.query.filter_by(facilitator_id=1).order_by(Session.time),
+        'facilitator_dashboard':
+            Session.query.filter_by(facilitator_id=1),
+        'get_session_bookings':
+            Booking.query.filter_by(session_id=1),
+        'get_registered_users':
+            User.list_select().order_by(desc(User.created_at), desc(User.id)).limit(21),
+        'get_registered_users: next page':
+            User.list_select().filter(User.created_at <= now, db.tuple_(User.created_at, User.id) < (now, 1))
+            .order_by(desc(User.created_at), desc(User.id)).limit(21),
+
+        # event_routes
+        'get_event: sessions':
+            Session.query.filter_by(event_id=1).order_by(Session.time),
+        'get_sessions: event filter':
+            Session.list_select().filter(Session.event_id == 1).order_by(desc(Session.time)),
+        'get_sessions: facilitator filter':
+            Session.list_select().filter(Session.facilitator_id == 1).order_by(desc(Session.time)),
+        'get_sessions':
+            Session.list_select().order_by(desc(Session.time), desc(Session.id)).limit(11),
+        'get_sessions: upcoming':
+            Session.list_select().filter(Session.time > now).order_by(desc(Session.time), desc(Session.id)).limit(11),
+        'get_sessions: next page':
+            Session.list_select().filter(Session.time <= now, db.tuple_(Session.time, Session.id) < (now, 1))
+            .order_by(desc(Session.time), desc(Session.id)).limit(11),
+        'get_events':
+            Event.list_select().order_by(desc(Event.start_date)),
+        'get_events: upcoming':
+            Event.list_select().filter(Event.start_date > now).order_by(desc(Event.start_date)),
+        'get_events: active':
+            Event.list_select().filter(Event.start_date <= now, Event.end_date >= now).order_by(desc(Event.start_date)),
+        'get_events: past':
+            Event.list_select().filter(Event.end_date < now).order_by(desc(Event.start_date)),
+    }
+
+
+def explain(query):
+    """Return the EXPLAIN QUERY PLAN detail lines for an ORM query or a Select"""
+    statement = getattr(query, 'statement', query)
+    compiled = statement.compile(dialect=db.engine.dialect)
+    # Parameter values do not influence the plan, so bind them all to NULL
+    params = tuple(None for _ in (compiled.positiontup or []))
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+# Queries allowed to SCAN on purpose, with the reason
+INTENDED_SCANS = {
+    # The unfiltered catalog pages newest-first by walking ix_events_start_end
+    # backwards; the page LIMIT stops the walk after one page
+    'get_events': 'ordered walk of the start_date index, bounded by the page size',
+    # No index orders by start_date and seeks on end_date; the walk skips the
+    # events that have not ended yet and stops after one page of past ones
+    'get_events: past': 'ordered walk of the start_date index, bounded by the page size',
+    # The unfiltered lists page by walking their ordering index
+    'get_sessions': 'ordered walk of ix_sessions_time, bounded by the page size',
+    'get_registered_users': 'ordered walk of ix_users_created_at, bounded by the page size',
+}
+
+
+def is_full_scan(detail):
+    """
+    A plan step walks a whole table or index rather than seeking into it
+
+    Only SEARCH steps (seeks on an index or the rowid) pass. "SCAN ... USING
+    INDEX" still visits every entry of the index, so it counts as a scan too.
+    """
+    return detail.startswith('SCAN')
+
+
+def check_query_plans():
+    """Explain every route query and report the ones that scan"""
+    failures = []
+
+    for name, query in route_queries().items():
+        plan = explain(query)
+        scans = [step for step in plan if is_full_scan(step)]
+        allowed = name in INTENDED_SCANS
+        # An intended scan is an ordered index walk; sorting the rows
+        # afterwards means every row was read
+        if allowed and any(step.startswith('USE TEMP B-TREE') for step in plan):
+            allowed = False
+        status = "❌" if scans and not allowed else "✅"
+        print(f"{status} {name}")
+        for step in plan:
+            print(f"      {step}")
+        if scans and allowed:
+            print(f"      (scan allowed: {INTENDED_SCANS[name]})")
+        elif scans:
+            failures.append(name)
+
+    return failures
+
+
+if __name__ == "__main__":
+    print("Checking query plans...")
+    print("=" * 50)
+
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print("❌ EXPLAIN QUERY PLAN is only available on SQLite")
+            sys.exit(2)
+
+        db.create_all()
+        failures = check_query_plans()
+
+    if failures:
+        print(f"\n❌ {len(failures)} queries scan a table or index instead of seeking:")
+        for name in failures:
+            print(f"   - {name}")
+        sys.exit(1)
+
+    print("\n🎉 All route queries seek on an index")
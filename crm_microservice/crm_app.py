@@ -5,6 +5,9 @@ os.environ['FLASK_DEBUG'] = '0'
 os.environ['FLASK_ENV'] = 'production'
 
 from flask import Flask, request, jsonify
+import gzip
+import hashlib
+import threading
 from flask_cors import CORS
 import json
 import logging
@@ -99,11 +102,12 @@ def log_notification(data: Dict[str, Any]) -> None:
     logger.info(f"Notification received: {json.dumps(log_entry, indent=2)}")
 
 def store_notification(data: Dict[str, Any]) -> None:
+    store_notifications([data])
+
+def store_notifications(items: list) -> None:
+    """Append several notifications with a single read and write of the log file"""
     log_path = app.config['NOTIFICATION_LOG_FILE']
-    notification_record = {
-        'timestamp': datetime.utcnow().isoformat(),
-        'data': data
-    }
+    now = datetime.utcnow().isoformat()
 
     notifications = []
     if os.path.exists(log_path):
@@ -113,12 +117,13 @@ def store_notification(data: Dict[str, Any]) -> None:
         except Exception:
             notifications = []
 
-    notifications.append(notification_record)
+    notifications.extend({'timestamp': now, 'data': data} for data in items)
 
     with open(log_path, 'w') as f:
         json.dump(notifications, f, indent=2)
 
-    logger.info(f"Stored booking_id {data['booking_id']}")
+    for data in items:
+        logger.info(f"Stored booking_id {data['booking_id']}")
 
 # -------------------- ROUTES --------------------
 @app.route('/notify', methods=['POST'])
@@ -150,6 +155,41 @@ def notify():
         logger.error(f"Exception: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/notify/batch', methods=['POST'])
+def notify_batch():
+    """Accept several booking notifications at once; all are rejected if any is invalid"""
+    auth_header = request.headers.get('Authorization')
+    if not validate_bearer_token(auth_header or ''):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+
+    data = request.get_json()
+    items = data.get('notifications') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'notifications must be a non-empty list'}), 400
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            return jsonify({'error': f'notifications[{index}] must be an object'}), 400
+        is_valid, error = validate_notification_payload(item)
+        if not is_valid:
+            return jsonify({'error': f'notifications[{index}]: {error}'}), 400
+
+    try:
+        for item in items:
+            log_notification(item)
+        store_notifications(items)
+        return jsonify({
+            'message': 'Notifications processed successfully',
+            'booking_ids': [item['booking_id'] for item in items],
+            'timestamp': datetime.utcnow().isoformat()
+        }), 200
+    except Exception as e:
+        logger.error(f"Exception: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -179,12 +219,40 @@ def get_notifications():
         logger.error(f"Error loading notifications: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+# -------------------- DASHBOARD PAGE CACHE --------------------
+# path -> (mtime_ns, size, body, gzipped body, etag); rebuilt when the file changes
+_page_cache = {}
+_page_lock = threading.Lock()
+
+def load_page(path: str) -> tuple:
+    stat = os.stat(path)
+    entry = _page_cache.get(path)
+    if entry and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+        return entry
+    with _page_lock:
+        with open(path, 'rb') as f:
+            body = f.read()
+        entry = (stat.st_mtime_ns, stat.st_size, body,
+                 gzip.compress(body, compresslevel=9, mtime=0),
+                 hashlib.sha256(body).hexdigest()[:32])
+        _page_cache[path] = entry
+        logger.info(f"Loaded {path} into the page cache")
+        return entry
+
 @app.route('/dashboard', methods=['GET'])
 def dashboard():
     """Serve the notifications dashboard HTML page"""
     try:
-        with open('notifications.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        _, _, body, gzipped, etag = load_page('notifications.html')
+        use_gzip = request.accept_encodings.quality('gzip') > 0 and len(gzipped) < len(body)
+        response = app.response_class(gzipped if use_gzip else body, mimetype='text/html')
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        # Strong ETag per byte sequence; revalidation is a cheap 304
+        response.set_etag(f"{etag}-gzip" if use_gzip else etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
     except FileNotFoundError:
         return "Dashboard file not found", 404
     except Exception as e:
@@ -2,11 +2,21 @@ from flask import Flask
 from flask_cors import CORS
 from main_app.config import Config
 from main_app.models import db, migrate
+from main_app.utils.admission import init_admission
+from main_app.utils.compression import init_compression
+from main_app.utils.database import configure_sqlite
+from main_app.utils.holds import init_holds
+from main_app.utils.json_provider import AppJSONProvider
+from main_app.utils.response_cache import init_response_cache
+from main_app.utils.static_pages import static_pages
+from main_app.utils.suggest import init_suggest
 from flask_jwt_extended import JWTManager
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    # orjson-backed JSON that encodes datetimes and enums itself
+    app.json = AppJSONProvider(app)
 
     # Enable CORS with specific configuration to prevent cross-tab conflicts
     CORS(app, 
@@ -19,6 +29,12 @@ def create_app():
 
     db.init_app(app)
     migrate.init_app(app, db)
+    configure_sqlite(app)
+    init_response_cache(app)
+    init_compression(app)
+    init_suggest(app)
+    init_holds(app)
+    init_admission(app)
     
     # Initialize JWT
     jwt = JWTManager(app)
@@ -31,6 +47,20 @@ def create_app():
     def health():
         return {"status": "healthy", "service": "main-event-app"}
 
+    @app.route("/index.html")
+    def index_page():
+        try:
+            return static_pages.serve('index')
+        except FileNotFoundError:
+            return "Page not found", 404
+
+    @app.route("/user_dashboard.html")
+    def user_dashboard_page():
+        try:
+            return static_pages.serve('user_dashboard')
+        except FileNotFoundError:
+            return "Page not found", 404
+
     # Import and register blueprints/routes here
     from main_app.routes.auth_routes import auth_bp
     from main_app.routes.event_routes import event_bp
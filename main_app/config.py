@@ -8,8 +8,12 @@ class Config:
     DEBUG = False
     TESTING = False
     
-    # Get database URI from environment or use default with absolute path
-    default_db_uri = os.getenv('SQLALCHEMY_DATABASE_URI')
+    # Get database URI from environment (DATABASE_URL is what hosting platforms
+    # such as Render provide) or use default with absolute path
+    default_db_uri = os.getenv('SQLALCHEMY_DATABASE_URI') or os.getenv('DATABASE_URL')
+    if default_db_uri and default_db_uri.startswith('postgres://'):
+        # SQLAlchemy only accepts the postgresql:// scheme
+        default_db_uri = 'postgresql://' + default_db_uri[len('postgres://'):]
     if not default_db_uri:
         # Use absolute path to the project root
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -19,15 +23,78 @@ class Config:
     
     SQLALCHEMY_DATABASE_URI = default_db_uri
     
-    # SQLite configuration for web applications
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-        'connect_args': {
-            'timeout': 20,
-            'check_same_thread': False
+    if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        # SQLite configuration for web applications (no pool_pre_ping:
+        # pinging a local database file before every checkout is wasted work)
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_recycle': 300,
+            'connect_args': {
+                'timeout': 20,
+                'check_same_thread': False
+            }
         }
-    }
+    else:
+        # Connection pool for server databases such as PostgreSQL. Size it so
+        # that workers * (pool_size + max_overflow) stays below max_connections
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_pre_ping': True,
+            'pool_recycle': 300,
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30))
+        }
+    
+    # Raise on relationship lazy loads the list endpoints did not eager-load
+    # (enable in tests to catch N+1 regressions)
+    SQLALCHEMY_RAISE_ON_LAZY_LOAD = os.getenv('SQLALCHEMY_RAISE_ON_LAZY_LOAD', 'false').lower() == 'true'
+
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))  # Negative values are KiB
+    SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+    SQLITE_FOREIGN_KEYS = os.getenv('SQLITE_FOREIGN_KEYS', 'true').lower() == 'true'
+    
+    # Retries for commits that hit "database is locked"
+    SQLITE_BUSY_RETRIES = int(os.getenv('SQLITE_BUSY_RETRIES', 5))
+    SQLITE_BUSY_BACKOFF = float(os.getenv('SQLITE_BUSY_BACKOFF', 0.05))  # Seconds, doubled per attempt
+    
+    # In-process cache of the public catalog GET responses (0 disables)
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 512))  # Entries per worker
+    RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 30))  # Seconds
+    
+    # Most sessions POST /api/bookings/batch books in one request
+    BATCH_BOOKING_LIMIT = int(os.getenv('BATCH_BOOKING_LIMIT', 20))
+    
+    # Per-session admission queue in front of the booking endpoints (per worker)
+    ADMISSION_RATE = float(os.getenv('ADMISSION_RATE', 20))  # Requests admitted per second per session; 0 disables
+    ADMISSION_BURST = int(os.getenv('ADMISSION_BURST', 10))  # Requests admitted at once before queueing starts
+    ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', 50))  # Requests waiting per session before 429s
+    ADMISSION_MAX_WAIT = float(os.getenv('ADMISSION_MAX_WAIT', 5))  # Seconds a queued request waits before a 429
+    
+    # Seat holds (POST /api/bookings/hold) and the sweeper releasing expired ones
+    HOLD_DURATION = int(os.getenv('HOLD_DURATION', 600))  # Seconds a held seat waits for confirmation
+    HOLD_SWEEP_INTERVAL = float(os.getenv('HOLD_SWEEP_INTERVAL', 30))  # Seconds between sweeps per worker; 0 disables
+    HOLD_SWEEP_BATCH_SIZE = int(os.getenv('HOLD_SWEEP_BATCH_SIZE', 500))  # Holds released per transaction
+    
+    # Idempotency-Key replay window for booking mutations
+    IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 86400))  # Seconds a key is remembered
+    IDEMPOTENCY_PURGE_INTERVAL = float(os.getenv('IDEMPOTENCY_PURGE_INTERVAL', 300))  # Seconds between purges per worker
+    
+    # /api/suggest typeahead index
+    SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', 8))  # Default suggestions per request
+    SUGGEST_REBUILD_INTERVAL = float(os.getenv('SUGGEST_REBUILD_INTERVAL', 300))  # Seconds between background full rebuilds (0 disables)
+    
+    # Negotiated response compression, in order of preference
+    COMPRESS_ALGORITHMS = os.getenv('COMPRESS_ALGORITHMS', 'zstd,br,gzip')
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))  # Bytes; smaller bodies are sent as is
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))  # 1-9
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))  # 0-11
+    COMPRESS_ZSTD_LEVEL = int(os.getenv('COMPRESS_ZSTD_LEVEL', 3))  # 1-22
+    
+    # Seconds the facilitator dashboard may reuse the global user count
+    USER_COUNT_CACHE_TTL = float(os.getenv('USER_COUNT_CACHE_TTL', 30))
     
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'myjwtsecret')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
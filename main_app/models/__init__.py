@@ -8,3 +8,6 @@ from main_app.models.user import User
 from main_app.models.event import Event
 from main_app.models.session import Session
 from main_app.models.booking import Booking, BookingStatus
+from main_app.models.idempotency import IdempotencyKey
+from main_app.models.waitlist import Waitlist
+from main_app.models.hold import SeatHold
@@ -1,6 +1,8 @@
 from main_app.models import db
 from datetime import datetime
 from enum import Enum
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 class BookingStatus(Enum):
     """Enum for booking status"""
@@ -15,9 +17,26 @@ class Booking(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     session_id = db.Column(db.Integer, db.ForeignKey('sessions.id'), nullable=False)
     status = db.Column(db.String(20), nullable=False, default=BookingStatus.BOOKED.value)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every write; a flush of a stale copy raises StaleDataError
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    __mapper_args__ = {'version_id_col': version}
+    
+    __table_args__ = (
+        # Duplicate/active-booking checks filter on all three columns
+        db.Index('ix_bookings_user_session_status', 'user_id', 'session_id', 'status'),
+        # Per-session counts and facilitator booking lists
+        db.Index('ix_bookings_session_status', 'session_id', 'status'),
+        # "My bookings" ordered by newest first
+        db.Index('ix_bookings_user_timestamp', 'user_id', 'timestamp'),
+        # At most one active booking per user and session
+        db.Index('uq_bookings_active_user_session', 'user_id', 'session_id', unique=True,
+                 sqlite_where=db.text("status = 'booked'"),
+                 postgresql_where=db.text("status = 'booked'")),
+    )
     
     # Relationships
     user = db.relationship('User', backref='bookings', lazy=True)
@@ -34,14 +53,15 @@ class Booking(db.Model):
             'user_id': self.user_id,
             'session_id': self.session_id,
             'status': self.status,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version,
+            'timestamp': self.timestamp,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'user_name': self.user.name if self.user else None,
             'user_email': self.user.email if self.user else None,
-            'session_time': self.session.time.isoformat() if self.session else None,
+            'session_time': self.session.time if self.session else None,
             'session_location': self.session.location if self.session else None,
-            'event_title': self.session.event.title if self.session and self.session.event else None
+            'event_title': self.session.parent_event.title if self.session and self.session.parent_event else None
         }
     
     @property
@@ -66,6 +86,69 @@ class Booking(db.Model):
         self.updated_at = datetime.utcnow()
         return self
     
+    @classmethod
+    def upsert_active(cls, user_id, session_id):
+        """
+        Create or reactivate the user's booking for a session in one statement
+        
+        The statement inserts a new booked row, or, when the user has a
+        cancelled booking for the session, takes over its id and flips it back
+        to booked via ON CONFLICT DO UPDATE. The partial unique index on active
+        bookings makes the statement fail with an IntegrityError when the user
+        already holds an active booking, so concurrent requests cannot create
+        duplicates. The caller is responsible for committing.
+        
+        Returns:
+            tuple: (booking, created) where created is False for a reactivation
+        """
+        now = datetime.utcnow()
+        
+        cancelled_id = (
+            db.select(cls.id)
+            .where(
+                cls.user_id == user_id,
+                cls.session_id == session_id,
+                cls.status == BookingStatus.CANCELLED.value
+            )
+            .order_by(cls.updated_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        
+        if db.session.get_bind().dialect.name == 'postgresql':
+            # An explicit NULL id does not fall back to the sequence on
+            # PostgreSQL, so draw the next id only when nothing is reactivated
+            insert = postgresql_insert
+            new_id = db.func.coalesce(
+                cancelled_id,
+                db.func.nextval(db.func.pg_get_serial_sequence(cls.__tablename__, 'id'))
+            )
+        else:
+            # SQLite assigns a fresh rowid when the id is NULL
+            insert = sqlite_insert
+            new_id = cancelled_id
+        
+        stmt = insert(cls).values(
+            id=new_id,
+            user_id=user_id,
+            session_id=session_id,
+            status=BookingStatus.BOOKED.value,
+            timestamp=now,
+            created_at=now,
+            updated_at=now,
+            version=1
+        ).on_conflict_do_update(
+            index_elements=[cls.id],
+            set_={'status': BookingStatus.BOOKED.value, 'updated_at': now, 'version': cls.version + 1}
+        ).returning(cls)
+        
+        booking = db.session.scalars(
+            stmt, execution_options={'populate_existing': True}
+        ).one()
+        
+        # Only a fresh insert writes our created_at
+        return booking, booking.created_at == now
+    
     @classmethod
     def get_user_bookings(cls, user_id, status=None):
         """Get all bookings for a user with optional status filter"""
@@ -1,4 +1,5 @@
 from main_app.models import db
+from main_app.models.session import Session
 from datetime import datetime
 
 class Event(db.Model):
@@ -13,24 +14,69 @@ class Event(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Upcoming/active/past filters and newest-first ordering
+        db.Index('ix_events_start_end', 'start_date', 'end_date'),
+    )
+    
     # Relationships
     sessions = db.relationship('Session', backref='parent_event', lazy=True, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Event {self.title}>'
     
-    def to_dict(self):
-        """Convert event to dictionary"""
-        return {
+    def to_dict(self, sessions_count=0, active_bookings_count=None):
+        """
+        Convert event to dictionary
+        
+        Args:
+            sessions_count (int): Number of sessions
+            active_bookings_count (int): Active bookings across the sessions;
+                left out of the result when not given
+        """
+        data = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'sessions_count': 0  # Will be calculated when needed
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'sessions_count': sessions_count
         }
+        if active_bookings_count is not None:
+            data['active_bookings_count'] = active_bookings_count
+        return data
+    
+    @classmethod
+    def list_select(cls):
+        """
+        Read-only select of the columns the event catalog emits
+        
+        Session and active booking counts are correlated subqueries (active
+        bookings from the maintained booked_count), each an index seek on
+        ix_sessions_event_time for one event. They run only for the rows the
+        page returns, so a page of events costs a single query whose work
+        grows with the page size rather than with the sessions table. Rows
+        map straight to dicts with row._asdict(), without building ORM
+        objects.
+        """
+        sessions = db.select(Session.id).where(Session.event_id == cls.id).correlate(cls)
+        sessions_count = sessions.with_only_columns(db.func.count(Session.id)).scalar_subquery()
+        active_bookings_count = sessions.with_only_columns(
+            db.func.coalesce(db.func.sum(Session.booked_count), 0)
+        ).scalar_subquery()
+        return db.select(
+            cls.id,
+            cls.title,
+            cls.description,
+            cls.start_date,
+            cls.end_date,
+            cls.created_at,
+            cls.updated_at,
+            sessions_count.label('sessions_count'),
+            active_bookings_count.label('active_bookings_count')
+        )
     
     @property
     def is_active(self):
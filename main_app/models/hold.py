@@ -0,0 +1,79 @@
+from main_app.models import db
+from datetime import datetime, timedelta
+
+class SeatHold(db.Model):
+    """
+    Seat set aside for a user for a few minutes before they confirm a booking
+
+    Every hold row is counted in Session.held_count, so capacity checks read
+    one counter instead of counting holds. Expired holds keep their seat
+    until the sweeper (main_app.utils.holds) deletes them.
+    """
+    __tablename__ = 'seat_holds'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    session_id = db.Column(db.Integer, db.ForeignKey('sessions.id', ondelete='CASCADE'), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # One hold per user and session
+        db.UniqueConstraint('user_id', 'session_id', name='uq_seat_holds_user_session'),
+        # The sweeper walks expired holds oldest first
+        db.Index('ix_seat_holds_expires_at', 'expires_at'),
+    )
+
+    # Relationships
+    user = db.relationship('User', backref=db.backref('seat_holds', passive_deletes=True), lazy=True)
+    session = db.relationship('Session', backref=db.backref('seat_holds', cascade='all, delete-orphan',
+                                                            passive_deletes=True), lazy=True)
+
+    def __repr__(self):
+        return f'<SeatHold {self.id} - User {self.user_id} Session {self.session_id}>'
+
+    def to_dict(self):
+        """Convert seat hold to dictionary"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'session_id': self.session_id,
+            'expires_at': self.expires_at,
+            'created_at': self.created_at
+        }
+
+    @property
+    def is_expired(self):
+        """Check if the hold ran out before being confirmed"""
+        return self.expires_at <= datetime.utcnow()
+
+    @classmethod
+    def place(cls, user_id, session_id, seconds):
+        """
+        Add a hold expiring in `seconds` (the caller takes the seat and commits)
+
+        The unique constraint on (user_id, session_id) raises an IntegrityError
+        when the user already holds a seat in the session.
+        """
+        now = datetime.utcnow()
+        hold = cls(user_id=user_id, session_id=session_id, created_at=now,
+                   expires_at=now + timedelta(seconds=seconds))
+        db.session.add(hold)
+        db.session.flush()
+        return hold
+
+    @classmethod
+    def expired_batch(cls, limit, now=None):
+        """
+        Oldest expired holds, at most `limit` of them, read off the expiry index
+
+        Returns:
+            list: (id, session_id) rows
+        """
+        now = now or datetime.utcnow()
+        return db.session.execute(
+            db.select(cls.id, cls.session_id)
+            .where(cls.expires_at <= now)
+            .order_by(cls.expires_at)
+            .limit(limit)
+        ).all()
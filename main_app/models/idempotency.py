@@ -0,0 +1,50 @@
+from main_app.models import db
+from datetime import datetime
+
+class IdempotencyKey(db.Model):
+    """
+    Stored outcome of a mutation sent with an Idempotency-Key header
+    
+    A retried request with the same key replays status_code,
+    response_body and response_headers instead of running again. status_code is NULL while the
+    first request is still in progress.
+    """
+    __tablename__ = 'idempotency_keys'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    # sha256 of method, path and body; a reused key with another request is rejected
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    # JSON object of the response headers a replay sends back (e.g. ETag)
+    response_headers = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    
+    __table_args__ = (
+        # Keys are scoped per user
+        db.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_key'),
+        # Purge of expired keys
+        db.Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+    
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key} - User {self.user_id}>'
+    
+    @property
+    def is_complete(self):
+        """Check if the original request has finished and its response is stored"""
+        return self.status_code is not None
+    
+    @classmethod
+    def purge_expired(cls, now=None):
+        """
+        Delete every expired key in one statement; the caller commits
+        
+        Returns:
+            int: Number of keys deleted
+        """
+        now = now or datetime.utcnow()
+        return cls.query.filter(cls.expires_at < now).delete(synchronize_session=False)
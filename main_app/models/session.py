@@ -1,6 +1,15 @@
 from main_app.models import db
+from main_app.models.user import User
 from datetime import datetime, timedelta
 
+
+def seats_available(capacity, booked_count, held_count=0):
+    """Number of free seats (neither booked nor held), or None if there is no capacity limit"""
+    if capacity is None:
+        return None
+    return max(capacity - (booked_count or 0) - (held_count or 0), 0)
+
+
 class Session(db.Model):
     """Session model for storing session information within events"""
     __tablename__ = 'sessions'
@@ -10,8 +19,28 @@ class Session(db.Model):
     facilitator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     time = db.Column(db.DateTime, nullable=False)
     location = db.Column(db.String(200), nullable=False)
+    capacity = db.Column(db.Integer, nullable=True)  # None means unlimited
+    booked_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Seats reserved by unexpired holds (see SeatHold), maintained like booked_count
+    held_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every ORM flush (the fields a facilitator edits); a flush of a
+    # stale copy raises StaleDataError instead of overwriting newer data. The
+    # guarded seat counter UPDATEs leave it alone, so bookings do not turn a
+    # facilitator's If-Match stale.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    __mapper_args__ = {'version_id_col': version}
+    
+    __table_args__ = (
+        # Facilitator views list their sessions ordered by time
+        db.Index('ix_sessions_facilitator_time', 'facilitator_id', 'time'),
+        # Event detail lists its sessions ordered by time
+        db.Index('ix_sessions_event_time', 'event_id', 'time'),
+        # The sessions list pages through every session ordered by time
+        db.Index('ix_sessions_time', 'time'),
+    )
     
     # Relationships
     facilitator = db.relationship('User', backref='facilitated_sessions', lazy=True)
@@ -27,14 +56,176 @@ class Session(db.Model):
             'id': self.id,
             'event_id': self.event_id,
             'facilitator_id': self.facilitator_id,
-            'time': self.time.isoformat() if self.time else None,
+            'time': self.time,
             'location': self.location,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'capacity': self.capacity,
+            'booked_count': self.booked_count,
+            'held_count': self.held_count,
+            'seats_available': self.seats_available,
+            'version': self.version,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'facilitator_name': self.facilitator.name if self.facilitator else None,
             'event_title': self.parent_event.title if self.parent_event else None
         }
     
+    @property
+    def seats_available(self):
+        """Number of free seats, or None if the session has no capacity limit"""
+        return seats_available(self.capacity, self.booked_count, self.held_count)
+    
+    @classmethod
+    def list_select(cls):
+        """
+        Read-only select of the columns Session.to_dict emits
+        
+        The facilitator name and event title come from joins rather than
+        loaded ORM objects; turn rows into dicts with row_to_dict().
+        """
+        from main_app.models.event import Event
+        
+        return db.select(
+            cls.id,
+            cls.event_id,
+            cls.facilitator_id,
+            cls.time,
+            cls.location,
+            cls.capacity,
+            cls.booked_count,
+            cls.held_count,
+            cls.version,
+            cls.created_at,
+            cls.updated_at,
+            User.name.label('facilitator_name'),
+            Event.title.label('event_title')
+        ).join(User, User.id == cls.facilitator_id).join(Event, Event.id == cls.event_id)
+    
+    @staticmethod
+    def row_to_dict(row):
+        """Convert a list_select() row to the dictionary to_dict would build"""
+        data = row._asdict()
+        data['seats_available'] = seats_available(data['capacity'], data['booked_count'], data['held_count'])
+        return data
+    
+    @property
+    def is_full(self):
+        """Check if every seat in the session is taken"""
+        return self.seats_available == 0
+    
+    @classmethod
+    def has_free_seats(cls, seats=1):
+        """SQL condition: `seats` more seats fit next to the booked and held ones"""
+        return db.or_(cls.capacity.is_(None), cls.booked_count + cls.held_count + seats <= cls.capacity)
+    
+    @classmethod
+    def reserve_seat(cls, session_id, seats=1):
+        """
+        Take seats in a session with a guarded UPDATE
+        
+        The capacity check and the increment happen in the same statement, so
+        concurrent bookings can never push booked_count past capacity. The
+        caller is responsible for committing.
+        
+        Args:
+            seats (int): Seats to take at once, all or none
+        
+        Returns:
+            bool: True if the seats were taken, False if too few are free
+        """
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.id == session_id, cls.has_free_seats(seats))
+            .values(booked_count=cls.booked_count + seats)
+        )
+        return result.rowcount == 1
+    
+    @classmethod
+    def reserve_seats(cls, session_ids):
+        """
+        Take one seat in each of several sessions with one guarded UPDATE
+        
+        Sessions that are already full are left alone, so a rowcount below
+        len(session_ids) means at least one of them had no seat left; the
+        caller should roll back. The caller is responsible for committing.
+        
+        Returns:
+            int: Number of sessions a seat was taken in
+        """
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.id.in_(session_ids), cls.has_free_seats())
+            .values(booked_count=cls.booked_count + 1)
+        )
+        return result.rowcount
+    
+    @classmethod
+    def release_seat(cls, session_id):
+        """Give back one seat in a session (the caller commits)"""
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id == session_id, cls.booked_count > 0)
+            .values(booked_count=cls.booked_count - 1)
+        )
+    
+    @classmethod
+    def hold_seat(cls, session_id):
+        """
+        Put one seat on hold with a guarded UPDATE, like reserve_seat
+        
+        Returns:
+            bool: True if a seat was held, False if the session is full
+        """
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.id == session_id, cls.has_free_seats())
+            .values(held_count=cls.held_count + 1)
+        )
+        return result.rowcount == 1
+    
+    @classmethod
+    def release_holds(cls, session_id, seats=1):
+        """Give back seats that were on hold (the caller commits)"""
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id == session_id, cls.held_count >= seats)
+            .values(held_count=cls.held_count - seats)
+        )
+    
+    @classmethod
+    def confirm_hold(cls, session_id):
+        """
+        Turn one held seat into a booked one (the caller commits)
+        
+        The seat is already accounted for, so there is no capacity guard.
+        """
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id == session_id, cls.held_count > 0)
+            .values(held_count=cls.held_count - 1, booked_count=cls.booked_count + 1)
+        )
+    
+    @classmethod
+    def facilitator_summary(cls, facilitator_id):
+        """
+        Session totals for a facilitator computed in one aggregate query
+        
+        Returns:
+            dict: total_sessions, upcoming_sessions and total_bookings (active
+                bookings, from the maintained booked_count)
+        """
+        now = datetime.utcnow()
+        total_sessions, upcoming_sessions, total_bookings = db.session.query(
+            db.func.count(cls.id),
+            db.func.coalesce(db.func.sum(db.case((cls.time > now, 1), else_=0)), 0),
+            db.func.coalesce(db.func.sum(cls.booked_count), 0)
+        ).filter(cls.facilitator_id == facilitator_id).one()
+        
+        return {
+            'total_sessions': total_sessions,
+            'upcoming_sessions': upcoming_sessions,
+            'total_bookings': total_bookings
+        }
+    
     @property
     def is_upcoming(self):
         """Check if session is upcoming"""
@@ -9,7 +9,12 @@ class User(db.Model):
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(100), nullable=False)
     role = db.Column(db.String(20), default='user')  # 'user' or 'facilitator'
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # The facilitator user list pages newest first
+        db.Index('ix_users_created_at', 'created_at'),
+    )
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -18,9 +23,14 @@ class User(db.Model):
             'name': self.name,
             'email': self.email,
             'role': self.role,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
     
+    @classmethod
+    def list_select(cls):
+        """Read-only select of the columns to_dict emits; rows map to dicts with row._asdict()"""
+        return db.select(cls.id, cls.name, cls.email, cls.role, cls.created_at)
+    
     @property
     def is_facilitator(self):
         """Check if user is a facilitator"""
@@ -0,0 +1,148 @@
+from main_app.models import db
+from main_app.models.booking import Booking, BookingStatus
+from main_app.models.session import Session, seats_available
+from main_app.utils.database import lock_booking_slot
+from datetime import datetime
+
+class Waitlist(db.Model):
+    """
+    Place of a user in the queue for a full session
+
+    Positions grow per session and are never renumbered: joining takes the
+    current maximum plus one and promotion takes the lowest ones, both as
+    seeks on the (session_id, position) index.
+    """
+    __tablename__ = 'waitlist_entries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    session_id = db.Column(db.Integer, db.ForeignKey('sessions.id', ondelete='CASCADE'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Head of the queue and the next free position
+        db.Index('ix_waitlist_entries_session_position', 'session_id', 'position', unique=True),
+        # A user waits at most once per session
+        db.UniqueConstraint('user_id', 'session_id', name='uq_waitlist_entries_user_session'),
+    )
+
+    # Relationships
+    user = db.relationship('User', backref=db.backref('waitlist_entries', passive_deletes=True), lazy=True)
+    session = db.relationship('Session', backref=db.backref('waitlist_entries', cascade='all, delete-orphan',
+                                                            passive_deletes=True), lazy=True)
+
+    def __repr__(self):
+        return f'<Waitlist {self.id} - User {self.user_id} Session {self.session_id} #{self.position}>'
+
+    def to_dict(self):
+        """Convert waitlist entry to dictionary"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'session_id': self.session_id,
+            'position': self.position,
+            'place': self.place,
+            'created_at': self.created_at
+        }
+
+    @property
+    def place(self):
+        """1-based place in the queue: entries still ahead of this one, plus one"""
+        ahead = db.session.scalar(
+            db.select(db.func.count()).select_from(Waitlist).where(
+                Waitlist.session_id == self.session_id,
+                Waitlist.position < self.position
+            )
+        )
+        return ahead + 1
+
+    @classmethod
+    def join(cls, user_id, session_id):
+        """
+        Append a user to the end of a session's queue
+
+        The caller should hold the session row lock (with_for_update) so
+        concurrent joins draw different positions. The unique constraint on
+        (user_id, session_id) raises an IntegrityError for a second join. The
+        caller is responsible for committing.
+
+        Returns:
+            Waitlist: The new entry
+        """
+        last = db.session.scalar(
+            db.select(db.func.max(cls.position)).where(cls.session_id == session_id)
+        )
+        entry = cls(user_id=user_id, session_id=session_id, position=(last or 0) + 1)
+        db.session.add(entry)
+        db.session.flush()
+        return entry
+
+    @classmethod
+    def leave(cls, user_id, session_id):
+        """
+        Remove a user from a session's queue (the caller commits)
+
+        Returns:
+            bool: True if the user was waiting
+        """
+        result = db.session.execute(
+            db.delete(cls).where(cls.user_id == user_id, cls.session_id == session_id)
+        )
+        return result.rowcount > 0
+
+    @classmethod
+    def promote(cls, session_id):
+        """
+        Book the head of a session's queue into every free seat
+
+        Reads the free seats once, takes that many entries off the front of
+        the queue with one index seek, books them and takes all their seats
+        with one guarded UPDATE. Entries of users who meanwhile booked the
+        session themselves are dropped without using a seat. Meant to run in
+        the transaction that freed the seats; the caller commits.
+
+        Returns:
+            list: (booking, created) for every promoted entry, in queue order
+        """
+        # On PostgreSQL the session row stays locked until commit, so two
+        # transactions freeing seats cannot promote the same entries
+        capacity, booked_count, held_count = db.session.execute(
+            db.select(Session.capacity, Session.booked_count, Session.held_count)
+            .where(Session.id == session_id)
+            .with_for_update()
+        ).one()
+        free = seats_available(capacity, booked_count, held_count)
+        if free == 0:
+            return []
+
+        head = db.select(cls).where(cls.session_id == session_id).order_by(cls.position)
+        if free is not None:
+            head = head.limit(free)
+        entries = db.session.scalars(head).all()
+        if not entries:
+            return []
+
+        already_booked = set(db.session.scalars(
+            db.select(Booking.user_id).where(
+                Booking.session_id == session_id,
+                Booking.user_id.in_([entry.user_id for entry in entries]),
+                Booking.status == BookingStatus.BOOKED.value
+            )
+        ))
+
+        db.session.execute(db.delete(cls).where(cls.id.in_([entry.id for entry in entries])))
+
+        promoted = []
+        for entry in entries:
+            if entry.user_id in already_booked:
+                continue
+            lock_booking_slot(entry.user_id, session_id)
+            promoted.append(Booking.upsert_active(entry.user_id, session_id))
+
+        if promoted and not Session.reserve_seat(session_id, seats=len(promoted)):
+            # Cannot happen while the session row is locked; fail loudly
+            # rather than overbook
+            raise RuntimeError(f"Session {session_id} lost its free seats during waitlist promotion")
+
+        return promoted
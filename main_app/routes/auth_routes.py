@@ -3,6 +3,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from main_app.models import db
 from main_app.models.user import User
 from main_app.routes.auth_service import AuthService
+from main_app.utils.cache import ttl_cache
+from main_app.utils.auth import current_user
 import re
 import bcrypt
 
@@ -62,13 +64,16 @@ def register():
         db.session.add(new_user)
         db.session.commit()
         
+        # The facilitator dashboard caches the user count
+        ttl_cache.invalidate('users:count')
+        
         return jsonify({
             'message': 'User registered successfully',
             'user': {
                 'id': new_user.id,
                 'name': new_user.name,
                 'email': new_user.email,
-                'created_at': new_user.created_at.isoformat()
+                'created_at': new_user.created_at
             }
         }), 201
         
@@ -103,8 +108,8 @@ def login():
         if not user or not AuthService.verify_password(password, user.password):
             return jsonify({'error': 'Invalid email or password'}), 401
         
-        # Generate JWT token
-        access_token = AuthService.generate_jwt(user.id)
+        # Generate JWT token; the role claim lets role checks skip the database
+        access_token = AuthService.generate_jwt(user.id, role=user.role)
         
         return jsonify({
             'message': 'Login successful',
@@ -125,8 +130,7 @@ def login():
 def get_profile():
     """Get current user profile"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -137,7 +141,7 @@ def get_profile():
                 'name': user.name,
                 'email': user.email,
                 'role': user.role,
-                'created_at': user.created_at.isoformat()
+                'created_at': user.created_at
             }
         }), 200
         
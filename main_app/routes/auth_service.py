@@ -56,13 +56,15 @@ class AuthService:
             return False
     
     @staticmethod
-    def generate_jwt(user_id: int, additional_claims: Optional[Dict[str, Any]] = None) -> str:
+    def generate_jwt(user_id: int, additional_claims: Optional[Dict[str, Any]] = None,
+                     role: Optional[str] = None) -> str:
         """
         Generate a JWT token for a user
         
         Args:
             user_id (int): User ID to include in token
             additional_claims (dict, optional): Additional claims to include in token
+            role (str, optional): User role, so role checks need no database lookup
             
         Returns:
             str: JWT token string
@@ -80,6 +82,8 @@ class AuthService:
                 'iat': datetime.utcnow(),
                 'exp': datetime.utcnow() + timedelta(hours=24)  # 24 hour expiration
             }
+            if role is not None:
+                payload['role'] = role
             
             # Add additional claims if provided
             if additional_claims:
@@ -3,10 +3,22 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from main_app.models import db
 from main_app.models.booking import Booking, BookingStatus
 from main_app.models.session import Session
-from main_app.models.user import User
+from main_app.models.waitlist import Waitlist
+from main_app.models.hold import SeatHold
+from main_app.utils.auth import current_user
 from main_app.services.notify_crm import CRMNotificationService
+from main_app.utils.database import retry_on_busy, lock_booking_slot
+from main_app.utils.pagination import paginate_query, InvalidCursor
+from main_app.utils.loading import with_loads, booking_loads, session_loads
+from main_app.utils.conditional import check_not_modified, check_if_match, version_conflict, versioned
+from main_app.utils.idempotency import idempotent
+from main_app.utils.admission import admission_controlled
+from main_app.utils.holds import release_hold
+from main_app.models.event import Event
 from datetime import datetime
 from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
 booking_bp = Blueprint('bookings', __name__)
 
@@ -20,62 +32,66 @@ def get_crm_service():
         _crm_service = CRMNotificationService()
     return _crm_service
 
+def crm_notification(booking, user, session, action):
+    """Keyword arguments of CRMNotificationService.send_booking_notification for one booking"""
+    # Prepare user data
+    user_data = {
+        'id': user.id,
+        'name': user.name,
+        'email': user.email
+    }
+    
+    # Prepare session data - add error checking
+    try:
+        session_data = {
+            'event_id': session.parent_event.id,
+            'event_title': session.parent_event.title,
+            'event_start_date': session.parent_event.start_date.isoformat(),
+            'facilitator_id': session.facilitator_id
+        }
+    except AttributeError as e:
+        current_app.logger.error(f"Session data error: {str(e)}")
+        # Use fallback data
+        session_data = {
+            'event_id': session.event_id,
+            'event_title': 'Unknown Event',
+            'event_start_date': session.time.isoformat(),
+            'facilitator_id': session.facilitator_id
+        }
+    
+    # Prepare notification data
+    try:
+        notification_data = {
+            'session_name': f"{session.parent_event.title} - {session.location}",
+            'session_time': session.time.isoformat(),
+            'session_location': session.location,
+            'facilitator_name': session.facilitator.name if session.facilitator else "Unknown"
+        }
+    except AttributeError as e:
+        current_app.logger.error(f"Notification data error: {str(e)}")
+        # Use fallback data
+        notification_data = {
+            'session_name': f"Session {session.id} - {session.location}",
+            'session_time': session.time.isoformat(),
+            'session_location': session.location,
+            'facilitator_name': "Unknown"
+        }
+    
+    return {
+        'booking_id': booking.id,
+        'user_data': user_data,
+        'session_data': session_data,
+        'action': action,
+        'additional_data': notification_data
+    }
+
 def send_crm_notification(booking, user, session, action="created"):
     """Send CRM notification for booking actions (simplified version to avoid reload issues)"""
     try:
         crm_service = get_crm_service()
         
-        # Prepare user data
-        user_data = {
-            'id': user.id,
-            'name': user.name,
-            'email': user.email
-        }
-        
-        # Prepare session data - add error checking
-        try:
-            session_data = {
-                'event_id': session.parent_event.id,
-                'event_title': session.parent_event.title,
-                'event_start_date': session.parent_event.start_date.isoformat(),
-                'facilitator_id': session.facilitator_id
-            }
-        except AttributeError as e:
-            current_app.logger.error(f"Session data error: {str(e)}")
-            # Use fallback data
-            session_data = {
-                'event_id': session.event_id,
-                'event_title': 'Unknown Event',
-                'event_start_date': session.time.isoformat(),
-                'facilitator_id': session.facilitator_id
-            }
-        
-        # Prepare notification data
-        try:
-            notification_data = {
-                'session_name': f"{session.parent_event.title} - {session.location}",
-                'session_time': session.time.isoformat(),
-                'session_location': session.location,
-                'facilitator_name': session.facilitator.name if session.facilitator else "Unknown"
-            }
-        except AttributeError as e:
-            current_app.logger.error(f"Notification data error: {str(e)}")
-            # Use fallback data
-            notification_data = {
-                'session_name': f"Session {session.id} - {session.location}",
-                'session_time': session.time.isoformat(),
-                'session_location': session.location,
-                'facilitator_name': "Unknown"
-            }
-        
         # Send notification to CRM
-        crm_service.send_booking_notification(
-            booking_id=booking.id,
-            user_data=user_data,
-            session_data=session_data,
-            action=action,
-            additional_data=notification_data
-        )
+        crm_service.send_booking_notification(**crm_notification(booking, user, session, action))
         
         current_app.logger.info(f"CRM notification sent for booking {booking.id} - {action}")
         
@@ -84,17 +100,101 @@ def send_crm_notification(booking, user, session, action="created"):
         current_app.logger.error(f"Failed to send CRM notification for booking {booking.id}: {str(e)}")
         # Don't re-raise the exception - let the booking succeed even if notification fails
 
+def send_crm_batch_notification(bookings, user, sessions, actions):
+    """Send one CRM request covering several bookings made together"""
+    booking_ids = [booking.id for booking in bookings]
+    try:
+        crm_service = get_crm_service()
+        
+        crm_service.send_batch_booking_notification([
+            crm_notification(booking, user, sessions[booking.session_id], actions[booking.id])
+            for booking in bookings
+        ])
+        
+        current_app.logger.info(f"CRM batch notification sent for bookings {booking_ids}")
+        
+    except Exception as e:
+        # Log error but don't fail the booking operation
+        current_app.logger.error(f"Failed to send CRM batch notification for bookings {booking_ids}: {str(e)}")
+
+def send_promotion_notifications(promoted):
+    """Send a CRM notification to every user promoted off a waitlist"""
+    if not promoted:
+        return
+    
+    # The commit expired the bookings; reload them with their user, session
+    # and event in one query instead of lazy loads per booking
+    bookings = with_loads(
+        Booking.query.filter(Booking.id.in_([booking.id for booking, _ in promoted])).order_by(Booking.id),
+        *booking_loads()
+    ).all()
+    for booking in bookings:
+        send_crm_notification(booking, booking.user, booking.session, "promoted")
+
+def book_seat(user_id, session_id):
+    """
+    Create or reactivate a user's booking and take its seat in one transaction
+    
+    A seat the user holds in the session (POST /hold) is converted into the
+    booking; otherwise a free seat is taken. The user also leaves the
+    session's waitlist. Commits on success.
+    
+    Returns:
+        tuple: (booking, created), or (None, False) when the session is full
+    
+    Raises:
+        IntegrityError: The user already has an active booking for the session
+    """
+    lock_booking_slot(user_id, session_id)
+    booking, created = Booking.upsert_active(user_id, session_id)
+    
+    held = db.session.execute(
+        db.delete(SeatHold).where(SeatHold.user_id == user_id, SeatHold.session_id == session_id)
+    ).rowcount
+    if held:
+        Session.confirm_hold(session_id)
+    # Take a seat in the same transaction; a full session undoes the booking
+    elif not Session.reserve_seat(session_id):
+        db.session.rollback()
+        return None, False
+    
+    # A booked user no longer needs their place in the queue
+    Waitlist.leave(user_id, session_id)
+    db.session.commit()
+    return booking, created
+
+def booked_response(booking, created, user, session):
+    """Notify the CRM of a new or reactivated booking and build the response"""
+    if not created:
+        # Send CRM notification for reactivation
+        send_crm_notification(booking, user, session, "reactivated")
+        
+        return versioned((jsonify({
+            'message': 'Booking reactivated successfully',
+            'booking': booking.to_dict()
+        }), 200), booking.version)
+    
+    # Send CRM notification for new booking
+    send_crm_notification(booking, user, session, "created")
+    
+    return versioned((jsonify({
+        'message': 'Session booked successfully',
+        'booking': booking.to_dict()
+    }), 201), booking.version)
+
 @booking_bp.route('/book', methods=['POST'])
 @jwt_required()
+@admission_controlled
+@idempotent
 def book_session():
     """Book a session for the authenticated user"""
     try:
-        # Get current user ID from JWT
-        current_user_id = get_jwt_identity()
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
         
-        # Get current user
-        current_user = User.query.get(current_user_id)
-        if not current_user:
+        # Get current user (memoized for the rest of the request)
+        user = current_user()
+        if not user:
             return jsonify({'error': 'User not found'}), 404
         
         # Get request data
@@ -109,8 +209,9 @@ def book_session():
         if not session_id:
             return jsonify({'error': 'session_id is required'}), 400
         
-        # Check if session exists
-        session = Session.query.get(session_id)
+        # Check if session exists; on PostgreSQL the row stays locked until
+        # commit so concurrent bookings for the same session queue up here
+        session = Session.query.with_for_update().filter_by(id=session_id).first()
         if not session:
             return jsonify({'error': 'Session not found'}), 404
         
@@ -118,58 +219,341 @@ def book_session():
         if session.is_past:
             return jsonify({'error': 'Cannot book a session that has already passed'}), 400
         
-        # Check if user already has an active booking for this session
-        existing_booking = Booking.query.filter_by(
-            user_id=current_user_id,
-            session_id=session_id,
-            status=BookingStatus.BOOKED.value
-        ).first()
-        
-        if existing_booking:
+        # Create or reactivate the booking in a single statement; the partial
+        # unique index on active bookings rejects duplicates atomically
+        try:
+            booking, created = retry_on_busy(lambda: book_seat(current_user_id, session_id))
+        except IntegrityError:
+            db.session.rollback()
             return jsonify({'error': 'You already have an active booking for this session'}), 409
         
-        # Check if user has a cancelled booking for this session
-        cancelled_booking = Booking.query.filter_by(
-            user_id=current_user_id,
-            session_id=session_id,
-            status=BookingStatus.CANCELLED.value
-        ).first()
+        if booking is None:
+            return jsonify({'error': 'Session is full'}), 409
+        
+        return booked_response(booking, created, user, session)
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in book_session: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@booking_bp.route('/hold', methods=['POST'])
+@jwt_required()
+@admission_controlled
+@idempotent
+def hold_seat():
+    """Hold a seat in a session for HOLD_DURATION seconds, to be confirmed later"""
+    try:
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
+        
+        # Get request data
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        session_id = data.get('session_id')
+        
+        # Validate required fields
+        if not session_id:
+            return jsonify({'error': 'session_id is required'}), 400
+        
+        # Check if session exists; on PostgreSQL the row stays locked until commit
+        session = Session.query.with_for_update().filter_by(id=session_id).first()
+        if not session:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        # Check if session is in the past
+        if session.is_past:
+            return jsonify({'error': 'Cannot hold a seat in a session that has already passed'}), 400
         
-        if cancelled_booking:
-            # Reactivate the cancelled booking
-            cancelled_booking.reactivate()
+        if Booking.user_has_booking_for_session(current_user_id, session_id):
+            return jsonify({'error': 'You already have an active booking for this session'}), 409
+        
+        # Record the hold and count its seat in held_count in one transaction
+        def apply_hold():
+            hold = SeatHold.place(current_user_id, session_id, current_app.config['HOLD_DURATION'])
+            if not Session.hold_seat(session_id):
+                db.session.rollback()
+                return None
             db.session.commit()
+            return hold
+        
+        try:
+            hold = retry_on_busy(apply_hold)
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'You already hold a seat in this session'}), 409
+        
+        if hold is None:
+            return jsonify({'error': 'Session is full'}), 409
+        
+        return jsonify({
+            'message': 'Seat held successfully',
+            'hold': hold.to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in hold_seat: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def release_and_promote(hold):
+    """Release a hold, hand its seat to the waitlist and notify promoted users"""
+    def apply_release():
+        released = release_hold(hold)
+        promoted = Waitlist.promote(hold.session_id) if released else []
+        db.session.commit()
+        return released, promoted
+    
+    released, promoted = retry_on_busy(apply_release)
+    send_promotion_notifications(promoted)
+    return released
+
+@booking_bp.route('/hold/<int:hold_id>/confirm', methods=['POST'])
+@jwt_required()
+@idempotent
+def confirm_hold(hold_id):
+    """Turn the authenticated user's seat hold into a booking"""
+    try:
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
+        
+        # Get current user (memoized for the rest of the request)
+        user = current_user()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        hold = db.session.get(SeatHold, hold_id)
+        if not hold:
+            return jsonify({'error': 'Hold not found'}), 404
+        
+        # Check if the hold belongs to the current user
+        if hold.user_id != current_user_id:
+            return jsonify({'error': 'You can only confirm your own holds'}), 403
+        
+        # An expired hold the sweeper has not reached yet is released now
+        if hold.is_expired:
+            release_and_promote(hold)
+            return jsonify({'error': 'Hold has expired'}), 410
+        
+        session = with_loads(Session.query.filter_by(id=hold.session_id), *session_loads()).first()
+        
+        try:
+            booking, created = retry_on_busy(lambda: book_seat(current_user_id, session.id))
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'You already have an active booking for this session'}), 409
+        
+        if booking is None:
+            # The hold was swept meanwhile and no free seat was left
+            return jsonify({'error': 'Hold has expired'}), 410
+        
+        return booked_response(booking, created, user, session)
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in confirm_hold: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@booking_bp.route('/hold/<int:hold_id>/release', methods=['POST'])
+@jwt_required()
+@idempotent
+def release_seat_hold(hold_id):
+    """Give back a seat the authenticated user holds"""
+    try:
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
+        
+        hold = db.session.get(SeatHold, hold_id)
+        if not hold:
+            return jsonify({'error': 'Hold not found'}), 404
+        
+        # Check if the hold belongs to the current user
+        if hold.user_id != current_user_id:
+            return jsonify({'error': 'You can only release your own holds'}), 403
+        
+        release_and_promote(hold)
+        
+        return jsonify({'message': 'Hold released successfully'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in release_seat_hold: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@booking_bp.route('/batch', methods=['POST'])
+@jwt_required()
+@admission_controlled
+@idempotent
+def book_sessions_batch():
+    """Book several sessions for the authenticated user, all or nothing"""
+    try:
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
+        
+        # Get current user (memoized for the rest of the request)
+        user = current_user()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # Get request data
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        session_ids = data.get('session_ids')
+        
+        # Validate required fields
+        if not isinstance(session_ids, list) or not session_ids:
+            return jsonify({'error': 'session_ids must be a non-empty list'}), 400
+        if not all(isinstance(sid, int) and not isinstance(sid, bool) and sid > 0 for sid in session_ids):
+            return jsonify({'error': 'session_ids must contain positive integers'}), 400
+        
+        # Repeated ids book the session once
+        session_ids = list(dict.fromkeys(session_ids))
+        limit = current_app.config['BATCH_BOOKING_LIMIT']
+        if len(session_ids) > limit:
+            return jsonify({'error': f'At most {limit} sessions can be booked at once'}), 400
+        
+        # Validate every session with two set-based queries; rows stay locked
+        # on PostgreSQL until commit, taken in id order to avoid deadlocks
+        sessions = {
+            session.id: session
+            for session in with_loads(
+                Session.query.filter(Session.id.in_(session_ids)).order_by(Session.id).with_for_update(of=Session),
+                *session_loads()
+            ).all()
+        }
+        already_booked = set(db.session.scalars(
+            db.select(Booking.session_id).where(
+                Booking.user_id == current_user_id,
+                Booking.session_id.in_(session_ids),
+                Booking.status == BookingStatus.BOOKED.value
+            )
+        ))
+        # Seats the user holds are converted like book_seat does, so the
+        # user's own hold does not make its session look full
+        held = set(db.session.scalars(
+            db.select(SeatHold.session_id).where(
+                SeatHold.user_id == current_user_id,
+                SeatHold.session_id.in_(session_ids)
+            )
+        ))
+        
+        def item_error(session_id):
+            session = sessions.get(session_id)
+            if session is None:
+                return 'Session not found'
+            if session.is_past:
+                return 'Cannot book a session that has already passed'
+            if session_id in already_booked:
+                return 'You already have an active booking for this session'
+            if session.is_full and session_id not in held:
+                return 'Session is full'
+            return None
+        
+        def rejected(errors, others):
+            # `others` is the status of the sessions that did not fail:
+            # not_attempted when validation stopped the batch, rolled_back
+            # when their bookings were written and then undone
+            db.session.rollback()
+            return jsonify({
+                'error': 'No sessions were booked',
+                'results': [
+                    {'session_id': sid, 'status': 'error', 'error': errors[sid]} if errors.get(sid)
+                    else {'session_id': sid, 'status': others}
+                    for sid in session_ids
+                ]
+            }), 409
+        
+        errors = {sid: item_error(sid) for sid in session_ids}
+        if any(errors.values()):
+            return rejected(errors, 'not_attempted')
+        
+        # Create or reactivate every booking and take every seat in one
+        # transaction; any failure rolls all of them back
+        def create_bookings():
+            results = []
+            for session_id in sorted(session_ids):
+                lock_booking_slot(current_user_id, session_id)
+                results.append(Booking.upsert_active(current_user_id, session_id))
             
-            # Send CRM notification for reactivation
-            send_crm_notification(cancelled_booking, current_user, session, "reactivated")
+            # Held seats become booked ones; only holds still there count,
+            # the sweeper may have released some since validation
+            confirmed = set()
+            for session_id in sorted(held):
+                if db.session.execute(
+                    db.delete(SeatHold).where(SeatHold.user_id == current_user_id,
+                                              SeatHold.session_id == session_id)
+                ).rowcount:
+                    Session.confirm_hold(session_id)
+                    confirmed.add(session_id)
             
-            return jsonify({
-                'message': 'Booking reactivated successfully',
-                'booking': cancelled_booking.to_dict()
-            }), 200
-        
-        # Create new booking
-        new_booking = Booking()
-        new_booking.user_id = current_user_id
-        new_booking.session_id = session_id
-        new_booking.status = BookingStatus.BOOKED.value
-        new_booking.timestamp = datetime.utcnow()
-        
-        # Save to database
-        db.session.add(new_booking)
-        db.session.commit()
+            unheld = [sid for sid in session_ids if sid not in confirmed]
+            if unheld and Session.reserve_seats(unheld) != len(unheld):
+                db.session.rollback()
+                return None
+            
+            db.session.execute(db.delete(Waitlist).where(
+                Waitlist.user_id == current_user_id,
+                Waitlist.session_id.in_(session_ids)
+            ))
+            db.session.commit()
+            return results
         
-        # Send CRM notification for new booking
-        send_crm_notification(new_booking, current_user, session, "created")
+        try:
+            results = retry_on_busy(create_bookings)
+        except IntegrityError:
+            # A concurrent request booked one of the sessions first
+            db.session.rollback()
+            return jsonify({'error': 'You already have an active booking for one of these sessions'}), 409
+        
+        if results is None:
+            # A session filled up after validation; report which ones
+            full = set(db.session.scalars(
+                db.select(Session.id).where(
+                    Session.id.in_(session_ids),
+                    db.not_(Session.has_free_seats())
+                )
+            ))
+            return rejected({sid: 'Session is full' for sid in full}
+                            or {sid: 'Session could not be reserved' for sid in session_ids},
+                            'rolled_back')
+        
+        actions = {booking.id: 'created' if created else 'reactivated' for booking, created in results}
+        
+        # The commit expired everything; reload what the CRM payload and
+        # to_dict read in two queries instead of lazy loads per booking
+        sessions = {
+            session.id: session
+            for session in with_loads(Session.query.filter(Session.id.in_(session_ids)), *session_loads()).all()
+        }
+        bookings = {
+            booking.session_id: booking
+            for booking in with_loads(Booking.query.filter(Booking.id.in_(list(actions))), *booking_loads()).all()
+        }
+        
+        # One CRM request for the whole batch
+        send_crm_batch_notification([bookings[sid] for sid in session_ids], user, sessions, actions)
         
         return jsonify({
-            'message': 'Session booked successfully',
-            'booking': new_booking.to_dict()
+            'message': f'{len(session_ids)} sessions booked successfully',
+            'results': [
+                {
+                    'session_id': sid,
+                    'status': actions[bookings[sid].id],
+                    'booking': bookings[sid].to_dict()
+                }
+                for sid in session_ids
+            ]
         }), 201
         
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"Error in book_session: {str(e)}")
+        current_app.logger.error(f"Error in book_sessions_batch: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @booking_bp.route('/my-bookings', methods=['GET'])
@@ -178,11 +562,9 @@ def get_my_bookings():
     """Get all bookings for the authenticated user"""
     try:
         # Get current user ID from JWT
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', type=str)  # booked, cancelled, all
         
         # Validate status parameter
@@ -196,17 +578,24 @@ def get_my_bookings():
         if status and status != 'all':
             query = query.filter_by(status=status)
         
-        # Order by timestamp (newest first)
-        query = query.order_by(desc(Booking.timestamp))
-        
-        # Apply pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        # Bookings show their session and event, so those count towards the ETag
+        booked_sessions = db.select(Booking.session_id).where(Booking.user_id == current_user_id)
+        not_modified = check_not_modified(
+            (query, Booking.updated_at),
+            (Session.query.filter(Session.id.in_(booked_sessions)), Session.updated_at),
+            (Event.query.filter(Event.id.in_(
+                db.select(Session.event_id).where(Session.id.in_(booked_sessions))
+            )), Event.updated_at),
+            identity=current_user_id
         )
+        if not_modified:
+            return not_modified
+        
+        # Load the user, session and event read by to_dict up front
+        query = with_loads(query, *booking_loads())
         
-        bookings = pagination.items
+        # Newest first; `cursor` seeks on (timestamp, id) instead of OFFSET
+        bookings, pagination = paginate_query(query, [Booking.timestamp, Booking.id], descending=True)
         
         # Convert to dictionary format
         bookings_data = []
@@ -216,26 +605,22 @@ def get_my_bookings():
         
         return jsonify({
             'bookings': bookings_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 @booking_bp.route('/cancel/<int:booking_id>', methods=['POST'])
 @jwt_required()
+@idempotent
 def cancel_booking(booking_id):
     """Cancel a booking for the authenticated user"""
     try:
-        # Get current user ID from JWT
-        current_user_id = get_jwt_identity()
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
         
         # Get the booking
         booking = Booking.query.get_or_404(booking_id)
@@ -244,6 +629,11 @@ def cancel_booking(booking_id):
         if booking.user_id != current_user_id:
             return jsonify({'error': 'You can only cancel your own bookings'}), 403
         
+        # Refuse to act on a version the client has not seen
+        conflict = check_if_match(booking.version)
+        if conflict:
+            return conflict
+        
         # Check if booking is already cancelled
         if booking.is_cancelled:
             return jsonify({'error': 'Booking is already cancelled'}), 400
@@ -252,14 +642,29 @@ def cancel_booking(booking_id):
         if booking.session.is_past:
             return jsonify({'error': 'Cannot cancel booking for a session that has already passed'}), 400
         
-        # Cancel the booking
-        booking.cancel()
-        db.session.commit()
+        # Cancel the booking, free its seat and hand it to the head of the
+        # waitlist, all in one transaction
+        def apply_cancel():
+            booking.cancel()
+            Session.release_seat(booking.session_id)
+            promoted = Waitlist.promote(booking.session_id)
+            db.session.commit()
+            return promoted
         
-        return jsonify({
+        try:
+            promoted = retry_on_busy(apply_cancel)
+        except StaleDataError:
+            # Another request changed the booking since it was loaded
+            db.session.rollback()
+            return version_conflict()
+        
+        # Send CRM notifications for the promoted waitlist entries
+        send_promotion_notifications(promoted)
+        
+        return versioned((jsonify({
             'message': 'Booking cancelled successfully',
             'booking': booking.to_dict()
-        }), 200
+        }), 200), booking.version)
         
     except Exception as e:
         db.session.rollback()
@@ -267,15 +672,16 @@ def cancel_booking(booking_id):
 
 @booking_bp.route('/reactivate/<int:booking_id>', methods=['POST'])
 @jwt_required()
+@idempotent
 def reactivate_booking(booking_id):
     """Reactivate a cancelled booking for the authenticated user"""
     try:
-        # Get current user ID from JWT
-        current_user_id = get_jwt_identity()
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
         
-        # Get current user
-        current_user = User.query.get(current_user_id)
-        if not current_user:
+        # Get current user (memoized for the rest of the request)
+        user = current_user()
+        if not user:
             return jsonify({'error': 'User not found'}), 404
         
         # Get the booking
@@ -285,6 +691,11 @@ def reactivate_booking(booking_id):
         if booking.user_id != current_user_id:
             return jsonify({'error': 'You can only reactivate your own bookings'}), 403
         
+        # Refuse to act on a version the client has not seen
+        conflict = check_if_match(booking.version)
+        if conflict:
+            return conflict
+        
         # Check if booking is already active
         if booking.is_active:
             return jsonify({'error': 'Booking is already active'}), 400
@@ -303,30 +714,146 @@ def reactivate_booking(booking_id):
         if existing_booking:
             return jsonify({'error': 'You already have an active booking for this session'}), 409
         
-        # Reactivate the booking
-        booking.reactivate()
-        db.session.commit()
+        # Take a seat back before reactivating the booking
+        def apply_reactivate():
+            lock_booking_slot(current_user_id, booking.session_id)
+            if not Session.reserve_seat(booking.session_id):
+                db.session.rollback()
+                return False
+            booking.reactivate()
+            Waitlist.leave(current_user_id, booking.session_id)
+            db.session.commit()
+            return True
+        
+        try:
+            if not retry_on_busy(apply_reactivate):
+                return jsonify({'error': 'Session is full'}), 409
+        except StaleDataError:
+            # Another request changed the booking since it was loaded
+            db.session.rollback()
+            return version_conflict()
         
         # Send CRM notification for reactivation
-        send_crm_notification(booking, current_user, booking.session, "reactivated")
+        send_crm_notification(booking, user, booking.session, "reactivated")
         
-        return jsonify({
+        return versioned((jsonify({
             'message': 'Booking reactivated successfully',
             'booking': booking.to_dict()
-        }), 200
+        }), 200), booking.version)
         
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error in reactivate_booking: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@booking_bp.route('/waitlist', methods=['POST'])
+@jwt_required()
+@admission_controlled
+@idempotent
+def join_waitlist():
+    """Join the waitlist of a full session for the authenticated user"""
+    try:
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
+        
+        # Get request data
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        session_id = data.get('session_id')
+        
+        # Validate required fields
+        if not session_id:
+            return jsonify({'error': 'session_id is required'}), 400
+        
+        # Check if session exists; on PostgreSQL the row stays locked until
+        # commit so concurrent joins draw distinct positions
+        session = Session.query.with_for_update().filter_by(id=session_id).first()
+        if not session:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        # Check if session is in the past
+        if session.is_past:
+            return jsonify({'error': 'Cannot join the waitlist of a session that has already passed'}), 400
+        
+        if Booking.user_has_booking_for_session(current_user_id, session_id):
+            return jsonify({'error': 'You already have an active booking for this session'}), 409
+        
+        # Only full sessions have a queue; otherwise the seat can be booked now
+        if not session.is_full:
+            return jsonify({'error': 'Session has free seats; book it instead'}), 409
+        
+        def apply_join():
+            entry = Waitlist.join(current_user_id, session_id)
+            db.session.commit()
+            return entry
+        
+        try:
+            entry = retry_on_busy(apply_join)
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'You are already on the waitlist for this session'}), 409
+        
+        return jsonify({
+            'message': 'Joined the waitlist successfully',
+            'waitlist': entry.to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in join_waitlist: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@booking_bp.route('/waitlist/<int:session_id>', methods=['GET'])
+@jwt_required()
+def get_waitlist_entry(session_id):
+    """Get the authenticated user's place on a session's waitlist"""
+    try:
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
+        
+        entry = Waitlist.query.filter_by(user_id=current_user_id, session_id=session_id).first()
+        if not entry:
+            return jsonify({'error': 'You are not on the waitlist for this session'}), 404
+        
+        return jsonify(entry.to_dict()), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@booking_bp.route('/waitlist/<int:session_id>/leave', methods=['POST'])
+@jwt_required()
+@idempotent
+def leave_waitlist(session_id):
+    """Leave a session's waitlist for the authenticated user"""
+    try:
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
+        
+        def apply_leave():
+            left = Waitlist.leave(current_user_id, session_id)
+            db.session.commit()
+            return left
+        
+        if not retry_on_busy(apply_leave):
+            return jsonify({'error': 'You are not on the waitlist for this session'}), 404
+        
+        return jsonify({'message': 'Left the waitlist successfully'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in leave_waitlist: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @booking_bp.route('/<int:booking_id>', methods=['GET'])
 @jwt_required()
 def get_booking(booking_id):
     """Get a specific booking for the authenticated user"""
     try:
-        # Get current user ID from JWT
-        current_user_id = get_jwt_identity()
+        # Get current user ID from JWT (identity is stored as a string)
+        current_user_id = int(get_jwt_identity())
         
         # Get the booking
         booking = Booking.query.get_or_404(booking_id)
@@ -335,6 +862,18 @@ def get_booking(booking_id):
         if booking.user_id != current_user_id:
             return jsonify({'error': 'You can only view your own bookings'}), 403
         
+        not_modified = check_not_modified(
+            (Booking.query.filter_by(id=booking_id), Booking.updated_at),
+            (Session.query.filter_by(id=booking.session_id), Session.updated_at),
+            (Event.query.filter(Event.id == db.select(Session.event_id).where(
+                Session.id == booking.session_id
+            ).scalar_subquery()), Event.updated_at),
+            identity=current_user_id,
+            version=(Booking.query.filter_by(id=booking_id), Booking.version)
+        )
+        if not_modified:
+            return not_modified
+        
         return jsonify(booking.to_dict()), 200
         
     except Exception as e:
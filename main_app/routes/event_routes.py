@@ -1,26 +1,32 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from main_app.models import db
 from main_app.models.event import Event
 from main_app.models.session import Session
 from main_app.models.booking import Booking, BookingStatus
 from datetime import datetime
-from sqlalchemy import desc
+from sqlalchemy import desc, and_
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from main_app.utils.pagination import paginate_query, InvalidCursor
+from main_app.utils.loading import with_loads, session_loads
+from main_app.utils.response_cache import cached_response, tag_response
+from main_app.utils.conditional import check_not_modified
+from main_app.utils.search import apply_search
+from main_app.utils.suggest import SOURCES, suggest_index
+from sqlalchemy.orm import selectinload
 
 event_bp = Blueprint('events', __name__)
 
 @event_bp.route('/events', methods=['GET'])
+@cached_response('events')
 def get_events():
     """Get all events with optional filtering and pagination"""
     try:
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', type=str)  # upcoming, active, past
         search = request.args.get('search', type=str)
         
-        # Build query
-        query = Event.query
+        # Read-only column select with session and booking counts
+        query = Event.list_select()
         
         # Apply status filter
         if status:
@@ -32,46 +38,39 @@ def get_events():
             elif status == 'past':
                 query = query.filter(Event.end_date < now)
         
-        # Apply search filter
+        # Apply search filter; FTS matches come back ranked by relevance
+        rank = None
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (Event.title.ilike(search_term)) |
-                (Event.description.ilike(search_term))
-            )
-        
-        # Order by start date (newest first)
-        query = query.order_by(desc(Event.start_date))
-        
-        # Apply pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+            query, rank = apply_search(query, Event, [Event.title, Event.description], search)
+        
+        # Session changes move the counts, so the sessions of the matching
+        # events count towards the ETag too
+        not_modified = check_not_modified(
+            (query, Event.updated_at),
+            (Session.query.filter(Session.event_id.in_(query.with_only_columns(Event.id))), Session.updated_at),
+            time_dependent=bool(status)
         )
+        if not_modified:
+            return not_modified
         
-        events = pagination.items
+        # Best match or newest first; `cursor` seeks on the sort key instead of OFFSET
+        if rank is not None:
+            rows, pagination = paginate_query(query, [rank, Event.id], descending=False)
+        else:
+            rows, pagination = paginate_query(query, [Event.start_date, Event.id], descending=True)
         
-        # Convert to dictionary format
-        events_data = []
-        for event in events:
-            event_dict = event.to_dict()
-            # Add sessions count
-            event_dict['sessions_count'] = len(event.sessions) if event.sessions else 0
-            events_data.append(event_dict)
+        # Rows already hold exactly the response fields
+        events_data = [row._asdict() for row in rows]
+        for event_data in events_data:
+            event_data.pop('search_rank', None)
         
         return jsonify({
             'events': events_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
@@ -81,11 +80,9 @@ def get_user_dashboard_events():
     """Get all events for user dashboard with booking information"""
     try:
         # Get current user ID from JWT
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', type=str)  # upcoming, active, past
         search = request.args.get('search', type=str)
         
@@ -102,51 +99,82 @@ def get_user_dashboard_events():
             elif status == 'past':
                 query = query.filter(Event.end_date < now)
         
-        # Apply search filter
+        # Apply search filter; FTS matches come back ranked by relevance
+        rank = None
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (Event.title.ilike(search_term)) |
-                (Event.description.ilike(search_term))
-            )
-        
-        # Order by start date (newest first)
-        query = query.order_by(desc(Event.start_date))
-        
-        # Apply pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+            query, rank = apply_search(query, Event, [Event.title, Event.description], search)
+        
+        # Event status labels follow the clock, so validators expire each minute
+        not_modified = check_not_modified(
+            (query, Event.updated_at),
+            (Session.query.filter(Session.event_id.in_(query.with_entities(Event.id).statement)), Session.updated_at),
+            (Booking.query.filter_by(user_id=current_user_id), Booking.updated_at),
+            identity=current_user_id,
+            time_dependent=True
         )
-        
-        events = pagination.items
+        if not_modified:
+            return not_modified
+        
+        # Best match or newest first; `cursor` seeks on the sort key instead of OFFSET
+        if rank is not None:
+            rows, pagination = paginate_query(query, [rank, Event.id], descending=False)
+            events = [row.Event for row in rows]
+        else:
+            events, pagination = paginate_query(query, [Event.start_date, Event.id], descending=True)
+        
+        # Load the sessions of every event on the page together with the
+        # user's booking for each of them in one query, instead of lazy-loading
+        # sessions and querying bookings per session
+        event_ids = [event.id for event in events]
+        session_rows = []
+        if event_ids:
+            session_rows = db.session.query(
+                Session.id,
+                Session.event_id,
+                Session.time,
+                Session.location,
+                Booking.id.label('booking_id'),
+                Booking.status.label('booking_status')
+            ).outerjoin(
+                Booking,
+                and_(Booking.session_id == Session.id, Booking.user_id == current_user_id)
+            ).filter(
+                Session.event_id.in_(event_ids)
+            ).order_by(Session.id, Booking.id).all()
+        
+        # Group by event in memory; a session can have several bookings by
+        # the same user (old cancelled ones), so prefer the active booking
+        sessions_by_event = {event_id: {} for event_id in event_ids}
+        for row in session_rows:
+            event_sessions = sessions_by_event[row.event_id]
+            current = event_sessions.get(row.id)
+            if current is None or (
+                row.booking_status == BookingStatus.BOOKED.value
+                and current.booking_status != BookingStatus.BOOKED.value
+            ):
+                event_sessions[row.id] = row
         
         # Convert to dictionary format with user-specific information
         events_data = []
         for event in events:
             event_dict = event.to_dict()
+            event_sessions = sessions_by_event[event.id]
             
             # Add sessions count
-            event_dict['sessions_count'] = len(event.sessions) if event.sessions else 0
+            event_dict['sessions_count'] = len(event_sessions)
             
             # Add user's booking information for this event
-            user_bookings = []
-            if event.sessions:
-                for session in event.sessions:
-                    booking = Booking.query.filter_by(
-                        user_id=current_user_id,
-                        session_id=session.id
-                    ).first()
-                    
-                    if booking:
-                        user_bookings.append({
-                            'session_id': session.id,
-                            'session_time': session.time.isoformat() if session.time else None,
-                            'session_location': session.location,
-                            'booking_status': booking.status,
-                            'booking_id': booking.id
-                        })
+            user_bookings = [
+                {
+                    'session_id': row.id,
+                    'session_time': row.time,
+                    'session_location': row.location,
+                    'booking_status': row.booking_status,
+                    'booking_id': row.booking_id
+                }
+                for row in event_sessions.values()
+                if row.booking_id is not None
+            ]
             
             event_dict['user_bookings'] = user_bookings
             event_dict['has_user_bookings'] = len(user_bookings) > 0
@@ -164,34 +192,28 @@ def get_user_dashboard_events():
         
         return jsonify({
             'events': events_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            },
+            'pagination': pagination,
             'user_id': current_user_id
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 @event_bp.route('/sessions', methods=['GET'])
+@cached_response('sessions')
 def get_sessions():
     """Get all sessions with optional filtering and pagination"""
     try:
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         event_id = request.args.get('event_id', type=int)
         facilitator_id = request.args.get('facilitator_id', type=int)
         status = request.args.get('status', type=str)  # upcoming, ongoing, past
         location = request.args.get('location', type=str)
         
-        # Build query
-        query = Session.query
+        # Read-only column select, joined to the facilitator and event names
+        query = Session.list_select()
         
         # Apply filters
         if event_id:
@@ -200,9 +222,9 @@ def get_sessions():
         if facilitator_id:
             query = query.filter(Session.facilitator_id == facilitator_id)
         
+        rank = None
         if location:
-            location_term = f"%{location}%"
-            query = query.filter(Session.location.ilike(location_term))
+            query, rank = apply_search(query, Session, [Session.location], location)
         
         # Apply status filter
         if status:
@@ -217,52 +239,65 @@ def get_sessions():
             elif status == 'past':
                 query = query.filter(Session.time < now)
         
-        # Order by time (newest first)
-        query = query.order_by(desc(Session.time))
-        
-        # Apply pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        # Sessions show their event title, so their events count towards the ETag
+        not_modified = check_not_modified(
+            (query, Session.updated_at),
+            (Event.query.filter(Event.id.in_(query.with_only_columns(Session.event_id))), Event.updated_at),
+            time_dependent=bool(status)
         )
+        if not_modified:
+            return not_modified
         
-        sessions = pagination.items
+        # Best location match or newest first; `cursor` seeks on the sort key instead of OFFSET
+        if rank is not None:
+            sessions, pagination = paginate_query(query, [rank, Session.id], descending=False)
+        else:
+            sessions, pagination = paginate_query(query, [Session.time, Session.id], descending=True)
         
-        # Convert to dictionary format
-        sessions_data = []
-        for session in sessions:
-            session_dict = session.to_dict()
-            sessions_data.append(session_dict)
+        # Convert rows to the same dictionaries Session.to_dict builds
+        sessions_data = [Session.row_to_dict(row) for row in sessions]
+        for session_data in sessions_data:
+            session_data.pop('search_rank', None)
         
         return jsonify({
             'sessions': sessions_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 @event_bp.route('/events/<int:event_id>', methods=['GET'])
+@cached_response('event:{event_id}')
 def get_event(event_id):
     """Get a specific event by ID with its sessions"""
     try:
+        not_modified = check_not_modified(
+            (Event.query.filter_by(id=event_id), Event.updated_at),
+            (Session.query.filter_by(event_id=event_id), Session.updated_at)
+        )
+        if not_modified:
+            return not_modified
+        
         event = Event.query.get_or_404(event_id)
         
         # Get event data
         event_data = event.to_dict()
         
-        # Get sessions for this event
-        sessions = Session.query.filter_by(event_id=event_id).order_by(Session.time).all()
+        # Get sessions for this event; they often share facilitators, so
+        # fetch those with one IN query rather than joining them per row
+        sessions = with_loads(
+            Session.query.filter_by(event_id=event_id),
+            *session_loads(facilitator_loader=selectinload)
+        ).order_by(Session.time).all()
         sessions_data = [session.to_dict() for session in sessions]
         
+        # Booking changes are reported per session, so the cached detail
+        # must go whenever one of its sessions changes
+        tag_response(*(f'session:{session.id}' for session in sessions))
+        
         event_data['sessions'] = sessions_data
         event_data['sessions_count'] = len(sessions_data)
         
@@ -272,10 +307,22 @@ def get_event(event_id):
         return jsonify({'error': 'Event not found'}), 404
 
 @event_bp.route('/sessions/<int:session_id>', methods=['GET'])
+@cached_response('session:{session_id}')
 def get_session(session_id):
     """Get a specific session by ID"""
     try:
+        session_event_id = db.select(Session.event_id).where(Session.id == session_id).scalar_subquery()
+        not_modified = check_not_modified(
+            (Session.query.filter_by(id=session_id), Session.updated_at),
+            (Event.query.filter(Event.id == session_event_id), Event.updated_at),
+            version=(Session.query.filter_by(id=session_id), Session.version)
+        )
+        if not_modified:
+            return not_modified
+        
         session = Session.query.get_or_404(session_id)
+        # The detail shows the event title
+        tag_response(f'event:{session.event_id}')
         return jsonify(session.to_dict()), 200
         
     except Exception as e:
@@ -284,8 +331,49 @@ def get_session(session_id):
 @event_bp.route('/events/<int:event_id>/sessions', methods=['GET'])
 @jwt_required()
 def get_event_sessions(event_id):
+    not_modified = check_not_modified(
+        (Event.query.filter_by(id=event_id), Event.updated_at),
+        (Session.query.filter_by(event_id=event_id), Session.updated_at)
+    )
+    if not_modified:
+        return not_modified
+    
     event = Event.query.get_or_404(event_id)
-    sessions = event.sessions
+    sessions = with_loads(
+        Session.query.filter_by(event_id=event.id),
+        *session_loads(facilitator_loader=selectinload)
+    ).all()
     return jsonify({
         'sessions': [s.to_dict() for s in sessions]
     }), 200
+
+@event_bp.route('/suggest', methods=['GET'])
+def suggest():
+    """Typeahead suggestions from event titles, session locations and facilitator names"""
+    try:
+        # Get query parameters
+        prefix = request.args.get('q', '', type=str)
+        limit = request.args.get('limit', current_app.config['SUGGEST_LIMIT'], type=int)
+        if limit is None or limit < 1:
+            limit = current_app.config['SUGGEST_LIMIT']
+        limit = min(limit, 50)
+        
+        kinds = None
+        types = request.args.get('types', type=str)
+        if types:
+            kinds = {kind.strip() for kind in types.split(',') if kind.strip()}
+            unknown = kinds - set(SOURCES)
+            if unknown:
+                return jsonify({'error': f"Unknown suggestion types: {', '.join(sorted(unknown))}. Use event, location or facilitator"}), 400
+        
+        # Served from the in-memory prefix index, never a table scan
+        suggestions = suggest_index.suggest(prefix, limit, kinds)
+        
+        return jsonify({
+            'query': prefix,
+            'suggestions': suggestions
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in suggest: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
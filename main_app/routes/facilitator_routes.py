@@ -5,20 +5,28 @@ from main_app.models.user import User
 from main_app.models.session import Session
 from main_app.models.booking import Booking, BookingStatus
 from main_app.models.event import Event
+from main_app.models.waitlist import Waitlist
+from main_app.routes.booking_routes import send_promotion_notifications
+from main_app.utils.database import retry_on_busy
+from main_app.utils.pagination import paginate_query, InvalidCursor
+from main_app.utils.loading import with_loads, booking_loads, session_loads
+from main_app.utils.cache import ttl_cache
+from main_app.utils.conditional import check_not_modified, check_if_match, version_conflict, versioned
+from main_app.utils.static_pages import static_pages
+from main_app.utils.auth import current_role
 from datetime import datetime
 from sqlalchemy import desc
+from sqlalchemy.orm.exc import StaleDataError
 
 facilitator_bp = Blueprint('facilitator', __name__)
 
 from functools import wraps
 
 def require_facilitator(f):
-    """Decorator to require facilitator role"""
+    """Decorator to require facilitator role (read from the token's claims)"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or not user.is_facilitator:
+        if current_role() != 'facilitator':
             return jsonify({'error': 'Facilitator access required'}), 403
         return f(*args, **kwargs)
     return decorated_function
@@ -30,12 +38,10 @@ def get_registered_users():
     """Get all registered users (facilitators only)"""
     try:
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         search = request.args.get('search', '').strip()
         
-        # Build query
-        query = User.query
+        # Read-only column select (never includes the password hash)
+        query = User.list_select()
         
         # Apply search filter
         if search:
@@ -44,36 +50,27 @@ def get_registered_users():
                 (User.email.ilike(f'%{search}%'))
             )
         
-        # Order by creation date (newest first)
-        query = query.order_by(desc(User.created_at))
-        
-        # Apply pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        # Users are never edited, so creation times and the count suffice
+        not_modified = check_not_modified(
+            (query, User.created_at),
+            identity=int(get_jwt_identity())
         )
+        if not_modified:
+            return not_modified
         
-        users = pagination.items
+        # Newest first; `cursor` seeks on (created_at, id) instead of OFFSET
+        users, pagination = paginate_query(query, [User.created_at, User.id], descending=True, default_per_page=20)
         
-        # Convert to dictionary format (exclude password)
-        users_data = []
-        for user in users:
-            user_dict = user.to_dict()
-            users_data.append(user_dict)
+        # Rows already hold exactly the response fields
+        users_data = [row._asdict() for row in users]
         
         return jsonify({
             'users': users_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error in get_registered_users: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -84,26 +81,25 @@ def get_registered_users():
 def get_my_sessions():
     """Get all sessions for the current facilitator"""
     try:
-        current_user_id = get_jwt_identity()
-        
-        # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        current_user_id = int(get_jwt_identity())
         
-        # Get sessions for this facilitator
+        # Sessions show their event, so those count towards the ETag
         query = Session.query.filter_by(facilitator_id=current_user_id)
-        
-        # Order by time (upcoming first)
-        query = query.order_by(Session.time)
-        
-        # Apply pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        not_modified = check_not_modified(
+            (query, Session.updated_at),
+            (Event.query.filter(Event.id.in_(
+                db.select(Session.event_id).where(Session.facilitator_id == current_user_id)
+            )), Event.updated_at),
+            identity=current_user_id
         )
+        if not_modified:
+            return not_modified
+        
+        # Get sessions for this facilitator with the event read below
+        query = with_loads(query, *session_loads())
         
-        sessions = pagination.items
+        # Upcoming first; `cursor` seeks on (time, id) instead of OFFSET
+        sessions, pagination = paginate_query(query, [Session.time, Session.id], descending=False)
         
         # Convert to dictionary format with additional info
         sessions_data = []
@@ -115,27 +111,22 @@ def get_my_sessions():
                 session_dict['event'] = {
                     'id': session.parent_event.id,
                     'title': session.parent_event.title,
-                    'start_date': session.parent_event.start_date.isoformat(),
-                    'end_date': session.parent_event.end_date.isoformat()
+                    'start_date': session.parent_event.start_date,
+                    'end_date': session.parent_event.end_date
                 }
             
-            # Add booking count
-            session_dict['booking_count'] = len([b for b in session.bookings if b.is_active])
+            # Add booking count (maintained on the session row)
+            session_dict['booking_count'] = session.booked_count
             
             sessions_data.append(session_dict)
         
         return jsonify({
             'sessions': sessions_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error in get_my_sessions: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -146,15 +137,24 @@ def get_my_sessions():
 def get_session_bookings(session_id):
     """Get all bookings for a specific session (facilitator must own the session)"""
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         
-        # Get the session and verify ownership
-        session = Session.query.get_or_404(session_id)
+        # Get the session with the facilitator and event its to_dict reads
+        session = with_loads(Session.query.filter_by(id=session_id), *session_loads()).first_or_404()
         if session.facilitator_id != current_user_id:
             return jsonify({'error': 'You can only view bookings for your own sessions'}), 403
         
+        not_modified = check_not_modified(
+            (Booking.query.filter_by(session_id=session_id), Booking.updated_at),
+            (Session.query.filter_by(id=session_id), Session.updated_at),
+            (Event.query.filter_by(id=session.event_id), Event.updated_at),
+            identity=current_user_id
+        )
+        if not_modified:
+            return not_modified
+        
         # Get all bookings for this session
-        bookings = Booking.query.filter_by(session_id=session_id).all()
+        bookings = with_loads(Booking.query.filter_by(session_id=session_id), *booking_loads()).all()
         
         # Convert to dictionary format
         bookings_data = []
@@ -178,41 +178,73 @@ def get_session_bookings(session_id):
 def update_session(session_id):
     """Update session details (facilitator must own the session)"""
     try:
-        current_user_id = get_jwt_identity()
+        # JWT identity is stored as a string
+        current_user_id = int(get_jwt_identity())
         
         # Get the session and verify ownership
         session = Session.query.get_or_404(session_id)
         if session.facilitator_id != current_user_id:
             return jsonify({'error': 'You can only modify your own sessions'}), 403
         
+        # Refuse to overwrite a version the client has not seen
+        conflict = check_if_match(session.version)
+        if conflict:
+            return conflict
+        
         # Get request data
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Update allowed fields
+        # Validate allowed fields
+        changes = {}
         if 'time' in data:
             try:
-                new_time = datetime.fromisoformat(data['time'].replace('Z', '+00:00'))
-                session.time = new_time
+                changes['time'] = datetime.fromisoformat(data['time'].replace('Z', '+00:00'))
             except ValueError:
                 return jsonify({'error': 'Invalid time format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'}), 400
         
         if 'location' in data:
             if not data['location'].strip():
                 return jsonify({'error': 'Location cannot be empty'}), 400
-            session.location = data['location'].strip()
-        
-        # Update timestamp
-        session.updated_at = datetime.utcnow()
-        
-        # Save to database
-        db.session.commit()
-        
-        return jsonify({
+            changes['location'] = data['location'].strip()
+        
+        if 'capacity' in data:
+            capacity = data['capacity']
+            if capacity is not None and (not isinstance(capacity, int) or isinstance(capacity, bool) or capacity < 0):
+                return jsonify({'error': 'Capacity must be a non-negative integer or null'}), 400
+            taken = session.booked_count + session.held_count
+            if capacity is not None and capacity < taken:
+                return jsonify({'error': f'Capacity cannot be lower than the {taken} seats already booked or held'}), 400
+            changes['capacity'] = capacity
+        
+        # Apply the changes and save; a retry after a busy rollback re-applies them.
+        # Seats added by a capacity raise go to the waitlist in the same transaction
+        def apply_update():
+            for field, value in changes.items():
+                setattr(session, field, value)
+            session.updated_at = datetime.utcnow()
+            promoted = []
+            if 'capacity' in changes:
+                db.session.flush()
+                promoted = Waitlist.promote(session_id)
+            db.session.commit()
+            return promoted
+        
+        try:
+            promoted = retry_on_busy(apply_update)
+        except StaleDataError:
+            # Another request changed the session since it was loaded
+            db.session.rollback()
+            return version_conflict()
+        
+        # Send CRM notifications for the promoted waitlist entries
+        send_promotion_notifications(promoted)
+        
+        return versioned((jsonify({
             'message': 'Session updated successfully',
             'session': session.to_dict()
-        }), 200
+        }), 200), session.version)
         
     except Exception as e:
         db.session.rollback()
@@ -238,6 +270,11 @@ def cancel_session(session_id):
             print(f"[DEBUG] 403: session.facilitator_id={session.facilitator_id}, current_user_id={current_user_id}")
             return jsonify({'error': 'You can only cancel your own sessions'}), 403
         
+        # Refuse to cancel a version the client has not seen
+        conflict = check_if_match(session.version)
+        if conflict:
+            return conflict
+        
         # Check if session is in the past
         if session.is_past:
             return jsonify({'error': 'Cannot cancel a session that has already passed'}), 400
@@ -249,8 +286,16 @@ def cancel_session(session_id):
         ).count()
         
         # Delete the session (this will cascade delete all bookings)
-        db.session.delete(session)
-        db.session.commit()
+        def apply_delete():
+            db.session.delete(session)
+            db.session.commit()
+        
+        try:
+            retry_on_busy(apply_delete)
+        except StaleDataError:
+            # The session or one of its bookings changed since it was loaded
+            db.session.rollback()
+            return version_conflict()
         
         return jsonify({
             'message': f'Session cancelled successfully. {active_bookings_count} bookings were also cancelled.',
@@ -268,28 +313,40 @@ def cancel_session(session_id):
 def facilitator_dashboard():
     """Get facilitator dashboard data"""
     try:
-        current_user_id = get_jwt_identity()
-        
-        # Get facilitator's sessions
-        sessions = Session.query.filter_by(facilitator_id=current_user_id).all()
+        current_user_id = int(get_jwt_identity())
+        
+        # Upcoming counts follow the clock, so validators expire each minute.
+        # The user total is cached anyway; the newest user (a seek on the
+        # primary key) is enough to notice registrations.
+        newest_user = db.select(db.func.max(User.id)).scalar_subquery()
+        not_modified = check_not_modified(
+            (Session.query.filter_by(facilitator_id=current_user_id), Session.updated_at),
+            (User.query.filter(User.id == newest_user), User.created_at),
+            identity=current_user_id,
+            time_dependent=True
+        )
+        if not_modified:
+            return not_modified
         
-        # Get total users
-        total_users = User.query.count()
+        # Session, upcoming and booking totals in one aggregate query
+        summary = Session.facilitator_summary(current_user_id)
         
-        # Get upcoming sessions
-        upcoming_sessions = [s for s in sessions if s.is_upcoming]
+        # Get total users (global, so a few seconds of staleness is fine)
+        total_users = ttl_cache.get_or_set(
+            'users:count', User.query.count, current_app.config['USER_COUNT_CACHE_TTL']
+        )
         
-        # Get total bookings across all sessions
-        total_bookings = 0
-        for session in sessions:
-            total_bookings += len([b for b in session.bookings if b.is_active])
+        # Last 5 sessions by time
+        recent_sessions = with_loads(
+            Session.query.filter_by(facilitator_id=current_user_id), *session_loads()
+        ).order_by(desc(Session.time)).limit(5).all()
         
         return jsonify({
             'total_users': total_users,
-            'total_sessions': len(sessions),
-            'upcoming_sessions': len(upcoming_sessions),
-            'total_bookings': total_bookings,
-            'recent_sessions': [s.to_dict() for s in sessions[:5]]  # Last 5 sessions
+            'total_sessions': summary['total_sessions'],
+            'upcoming_sessions': summary['upcoming_sessions'],
+            'total_bookings': summary['total_bookings'],
+            'recent_sessions': [s.to_dict() for s in recent_sessions]
         }), 200
         
     except Exception as e:
@@ -300,16 +357,7 @@ def facilitator_dashboard():
 def facilitator_dashboard_page():
     """Serve the facilitator dashboard HTML page"""
     try:
-        # Read the facilitator dashboard HTML file
-        import os
-        dashboard_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'facilitator_dashboard.html')
-        
-        with open(dashboard_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # Set proper content type
-        from flask import Response
-        return Response(html_content, mimetype='text/html')
+        return static_pages.serve('facilitator_dashboard')
     except FileNotFoundError:
         return "Facilitator dashboard not found", 404
     except Exception as e:
@@ -320,18 +368,9 @@ def facilitator_dashboard_page():
 def facilitator_dashboard_html():
     """Serve the facilitator dashboard HTML page (alternative route)"""
     try:
-        # Read the facilitator dashboard HTML file
-        import os
-        dashboard_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'facilitator_dashboard.html')
-        
-        with open(dashboard_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # Set proper content type
-        from flask import Response
-        return Response(html_content, mimetype='text/html')
+        return static_pages.serve('facilitator_dashboard')
     except FileNotFoundError:
         return "Facilitator dashboard not found", 404
     except Exception as e:
         current_app.logger.error(f"Error serving facilitator dashboard: {str(e)}")
-        return "Internal server error", 500 
\ No newline at end of file
+        return "Internal server error", 500
@@ -40,24 +40,7 @@ class CRMNotificationService:
         """
         try:
             # Prepare the notification payload in the format expected by CRM service
-            payload = {
-                'booking_id': booking_id,
-                'user': {
-                    'id': user_data['id'],
-                    'name': user_data['name'],
-                    'email': user_data['email']
-                },
-                'event': {
-                    'id': session_data['event_id'],
-                    'title': session_data['event_title'],
-                    'start_date': session_data['event_start_date']
-                },
-                'facilitator_id': session_data['facilitator_id']
-            }
-            
-            # Add additional data if provided
-            if additional_data:
-                payload['additional_data'] = additional_data
+            payload = self._booking_payload(booking_id, user_data, session_data, additional_data)
             
             # Prepare headers with authentication
             headers = {
@@ -109,6 +92,102 @@ class CRMNotificationService:
             self.logger.error(error_msg)
             raise Exception(error_msg)
     
+    @staticmethod
+    def _booking_payload(booking_id: int,
+                         user_data: dict,
+                         session_data: dict,
+                         additional_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Booking notification payload in the format the CRM /notify endpoint validates"""
+        payload = {
+            'booking_id': booking_id,
+            'user': {
+                'id': user_data['id'],
+                'name': user_data['name'],
+                'email': user_data['email']
+            },
+            'event': {
+                'id': session_data['event_id'],
+                'title': session_data['event_title'],
+                'start_date': session_data['event_start_date']
+            },
+            'facilitator_id': session_data['facilitator_id']
+        }
+        
+        # Add additional data if provided
+        if additional_data:
+            payload['additional_data'] = additional_data
+        return payload
+    
+    def send_batch_booking_notification(self, notifications: list) -> Dict[str, Any]:
+        """
+        Send several booking notifications to the CRM service in one request
+        
+        Args:
+            notifications (list): Dicts with the keyword arguments of
+                send_booking_notification (booking_id, user_data,
+                session_data, action, additional_data)
+            
+        Returns:
+            dict: Response from the CRM service
+            
+        Raises:
+            Exception: If the request fails
+        """
+        try:
+            payload = {
+                'notifications': [
+                    dict(self._booking_payload(n['booking_id'], n['user_data'], n['session_data'],
+                                               n.get('additional_data')),
+                         action=n['action'])
+                    for n in notifications
+                ]
+            }
+            
+            headers = {
+                'Content-Type': 'application/json',
+                'Authorization': f'Bearer {self.auth_token}'
+            }
+            
+            url = f"{self.base_url}/notify/batch"
+            self.logger.info(f"Sending {len(notifications)} booking notifications to {url}")
+            
+            response = requests.post(
+                url=url,
+                json=payload,
+                headers=headers,
+                timeout=10  # 10 second timeout
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            self.logger.info(f"Batch booking notification sent successfully: {result}")
+            return result
+            
+        except requests.exceptions.Timeout:
+            error_msg = f"Timeout while sending batch booking notification to CRM service"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        except requests.exceptions.ConnectionError:
+            error_msg = f"Connection error while sending batch booking notification to CRM service"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        except requests.exceptions.HTTPError as e:
+            error_msg = f"HTTP error {e.response.status_code} while sending batch booking notification: {e.response.text}"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        except json.JSONDecodeError as e:
+            error_msg = f"Invalid JSON response from CRM service: {str(e)}"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        except Exception as e:
+            error_msg = f"Unexpected error sending batch booking notification: {str(e)}"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+    
     def send_notification(self, 
                          notification_type: str,
                          user_id: int,
@@ -0,0 +1,211 @@
+import math
+import threading
+import time
+from collections import deque
+from functools import wraps
+from flask import current_app, jsonify, request
+from main_app.utils.idempotency import has_stored_response
+
+# Idle gates kept before the unused ones are dropped
+MAX_IDLE_GATES = 1024
+
+
+class Rejected(Exception):
+    """Raised when a request cannot be admitted; retry_after is in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    Token bucket with a FIFO queue in front of one session
+
+    Tokens refill at `rate` per second up to `burst`. A request takes a
+    token straight away only when nobody is queued; otherwise it joins the
+    back of the queue and is admitted when it reaches the front and a token
+    is there. Waiting is bounded by `max_wait`, and a full queue rejects at
+    once with the time the queue needs to drain.
+    """
+
+    def __init__(self, rate, burst, queue_size, max_wait):
+        self.rate = rate
+        self.burst = burst
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queue = deque()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def idle(self):
+        """Nobody is waiting and the bucket is full again"""
+        with self._cond:
+            self._refill(time.monotonic())
+            return not self._queue and self._tokens >= self.burst
+
+    def admit(self):
+        """
+        Block until this request may proceed
+
+        Raises:
+            Rejected: The queue is full, or the wait would exceed max_wait
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if not self._queue and self._tokens >= 1:
+                self._tokens -= 1
+                return
+            if len(self._queue) >= self.queue_size:
+                raise Rejected((len(self._queue) + 1 - self._tokens) / self.rate)
+
+            ticket = object()
+            self._queue.append(ticket)
+            deadline = now + self.max_wait
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._queue[0] is ticket and self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    if now >= deadline:
+                        raise Rejected(len(self._queue) / self.rate)
+                    # The head sleeps until its token arrives; the rest wait
+                    # for the head to leave
+                    if self._queue[0] is ticket:
+                        timeout = (1 - self._tokens) / self.rate
+                    else:
+                        timeout = deadline - now
+                    self._cond.wait(min(timeout, deadline - now))
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+
+    def refund(self):
+        """Give back the token of a request that was admitted but did not proceed"""
+        with self._cond:
+            self._refill(time.monotonic())
+            self._tokens = min(self.burst, self._tokens + 1)
+            self._cond.notify_all()
+
+
+class AdmissionController:
+    """
+    AdmissionGate per session, created on first use
+
+    Gates live in process memory, so every worker process meters its own
+    share and the database sees up to workers x rate per session. Queued
+    requests block their thread while they wait, which only makes sense
+    when a worker serves several requests at once: run gunicorn with
+    threaded (gthread) or gevent workers, as the Procfile does. With
+    one-request sync workers the queue never forms and a wait stalls the
+    whole worker.
+    """
+
+    def __init__(self):
+        self.rate = 0
+        self.burst = 1
+        self.queue_size = 0
+        self.max_wait = 0
+        self._gates = {}
+        self._lock = threading.Lock()
+
+    def configure(self, rate, burst, queue_size, max_wait):
+        """Apply new limits; existing gates are dropped"""
+        with self._lock:
+            self.rate, self.burst, self.queue_size, self.max_wait = rate, burst, queue_size, max_wait
+            self._gates.clear()
+
+    def gate(self, key):
+        """Gate for one key, dropping idle gates once there are many"""
+        with self._lock:
+            gate = self._gates.get(key)
+            if gate is None:
+                if len(self._gates) >= MAX_IDLE_GATES:
+                    self._gates = {k: g for k, g in self._gates.items() if not g.idle}
+                gate = AdmissionGate(self.rate, self.burst, self.queue_size, self.max_wait)
+                self._gates[key] = gate
+            return gate
+
+    def admit(self, keys):
+        """
+        Pass through the gate of every key, in sorted order
+
+        A request rejected at one gate gives its tokens back to the gates it
+        already passed, so a batch that ends up with a 429 does not use up
+        capacity of sessions it never booked.
+
+        Raises:
+            Rejected: One of the gates turned the request away
+        """
+        if self.rate <= 0:
+            return
+        passed = []
+        try:
+            for key in sorted(set(keys)):
+                gate = self.gate(key)
+                gate.admit()
+                passed.append(gate)
+        except Rejected:
+            for gate in passed:
+                gate.refund()
+            raise
+
+
+admission = AdmissionController()
+
+
+def _session_keys():
+    """Session ids a booking request targets, from `session_id` or `session_ids`"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return []
+    ids = data.get('session_ids')
+    if not isinstance(ids, list):
+        ids = [data.get('session_id')]
+    return [sid for sid in ids if isinstance(sid, int) and not isinstance(sid, bool)]
+
+
+def admission_controlled(view):
+    """
+    Queue booking requests per session so the database sees a bounded write rate
+
+    Requests for the same session pass through its token bucket in arrival
+    order. Requests that would wait longer than ADMISSION_MAX_WAIT, or find
+    ADMISSION_QUEUE_SIZE requests already queued, get 429 Too Many Requests
+    with Retry-After straight away. Apply below @jwt_required() and above
+    @idempotent, so a rejected request leaves its Idempotency-Key unused.
+    A retry whose Idempotency-Key already has a stored response skips the
+    gate and gets its replay instead of spending a token or a 429.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            if admission.rate > 0 and not has_stored_response():
+                admission.admit(_session_keys())
+        except Rejected as e:
+            current_app.logger.warning(f"Admission rejected {request.path}: {str(e)}")
+            response = jsonify({'error': 'Too many booking requests for this session, please retry shortly'})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(max(1, math.ceil(e.retry_after)))
+            return response
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_admission(app):
+    """Configure the per-session admission gates from the config"""
+    admission.configure(
+        app.config['ADMISSION_RATE'],
+        app.config['ADMISSION_BURST'],
+        app.config['ADMISSION_QUEUE_SIZE'],
+        app.config['ADMISSION_MAX_WAIT']
+    )
@@ -0,0 +1,40 @@
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from main_app.models import db
+from main_app.models.user import User
+
+
+def current_user_id():
+    """Id of the authenticated user (the JWT identity is stored as a string)"""
+    return int(get_jwt_identity())
+
+
+def current_user():
+    """
+    The authenticated user's row, loaded at most once per request
+
+    Returns:
+        User: The user, or None when the account no longer exists
+    """
+    user_id = current_user_id()
+    # Keyed by id: scripts and tests may share one app context, and so one
+    # `g`, across requests made as different users
+    memo = g.get('current_user')
+    if memo is None or memo[0] != user_id:
+        memo = (user_id, db.session.get(User, user_id))
+        g.current_user = memo
+    return memo[1]
+
+
+def current_role():
+    """
+    The authenticated user's role, read from the token's claims
+
+    Tokens issued before the role claim existed fall back to the user row.
+    A role change takes effect when the user next logs in.
+    """
+    role = get_jwt().get('role')
+    if role is None:
+        user = current_user()
+        role = user.role if user else None
+    return role
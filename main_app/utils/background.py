@@ -0,0 +1,58 @@
+import os
+import threading
+from main_app.models import db
+
+
+class PeriodicThread:
+    """
+    Background thread running `run_once(app)` every few seconds
+
+    Started by the first request a worker process serves, so each gunicorn
+    worker runs its own thread after forking and CLI commands run none.
+    Subclasses set `name` and implement `interval(app)` and `run_once(app)`;
+    each run gets a fresh app context and database session.
+    """
+
+    name = 'periodic'
+
+    def __init__(self):
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def interval(self, app):
+        """Seconds between runs"""
+        raise NotImplementedError
+
+    def run_once(self, app):
+        """One unit of work, inside an app context"""
+        raise NotImplementedError
+
+    def ensure_started(self, app):
+        """Start the thread in this process unless it is already running"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(app,), name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Ask the thread to exit after its current run"""
+        self._stop.set()
+
+    def _run(self, app):
+        interval = self.interval(app)
+        while not self._stop.wait(interval):
+            with app.app_context():
+                try:
+                    self.run_once(app)
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"Error in {self.name}: {str(e)}")
+                finally:
+                    db.session.remove()
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache whose entries expire after a TTL
+
+    Each worker process keeps its own copy, so this suits values that may be
+    a few seconds stale, such as global counters shown on dashboards.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key, compute, ttl):
+        """
+        Return the cached value for key, computing and storing it when missing
+        or expired
+
+        Args:
+            key (str): Cache key
+            compute (callable): Produces the value on a miss
+            ttl (float): Seconds the value stays fresh; 0 disables caching
+
+        Returns:
+            The cached or freshly computed value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+
+        # Compute outside the lock so a slow query does not block other keys
+        value = compute()
+        if ttl > 0:
+            with self._lock:
+                self._entries[key] = (value, now + ttl)
+        return value
+
+    def invalidate(self, key):
+        """Drop a cached value so the next read recomputes it"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every cached value"""
+        with self._lock:
+            self._entries.clear()
+
+
+class TaggedLRUCache:
+    """
+    Size-bounded LRU cache with a TTL and tag-based invalidation
+
+    Entries carry tags such as 'event:3'; invalidating a tag drops every
+    entry carrying it. `generation` increases on every invalidation, so a
+    caller can tell whether a value it computed may already be stale.
+    """
+
+    def __init__(self, max_entries=512, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key):
+        """Return the cached value for key, or None when missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires, tags = entry
+            if expires <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, tags=(), generation=None):
+        """
+        Store a value under key with the given tags
+
+        When `generation` is given and something was invalidated since it
+        was read, the value is dropped instead of stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            tags = frozenset(tags)
+            self._entries[key] = (value, time.monotonic() + self.ttl, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags):
+        """Drop every entry carrying any of the tags"""
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+# Shared cache for aggregate values
+ttl_cache = TTLCache()
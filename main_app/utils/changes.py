@@ -0,0 +1,103 @@
+from collections import namedtuple
+from sqlalchemy import event
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+from main_app.models import db
+
+# One committed row change. `id` is None when a bulk statement changed rows
+# that cannot be identified; `values` holds foreign keys such as event_id
+# or session_id when they are known.
+Change = namedtuple('Change', ['table', 'id', 'values'])
+
+# Foreign keys subscribers use to work out what else a change affects
+TRACKED_KEYS = ('event_id', 'session_id', 'user_id')
+
+_subscribers = []
+_installed = False
+
+
+def subscribe(callback):
+    """
+    Call `callback(changes)` with the list of Change records after every commit
+
+    Callbacks run after the transaction is durable, so they never see writes
+    that were rolled back. Exceptions are the callback's own business and
+    propagate to the committing code.
+    """
+    _subscribers.append(callback)
+
+
+def _record(session, change):
+    session.info.setdefault('pending_changes', []).append(change)
+
+
+def _object_change(obj):
+    """Change record for an ORM object in the flush"""
+    values = {key: getattr(obj, key) for key in TRACKED_KEYS if hasattr(obj, key)}
+    return Change(obj.__tablename__, getattr(obj, 'id', None), values)
+
+
+def _statement_id(statement, pk):
+    """Primary key a bulk UPDATE/DELETE is restricted to by `pk == value`, or None"""
+    where = getattr(statement, 'whereclause', None)
+    if where is None:
+        return None
+    # Only a top-level AND term pins the statement to one row
+    if isinstance(where, BooleanClauseList) and where.operator is operators.and_:
+        terms = where.clauses
+    else:
+        terms = [where]
+    for term in terms:
+        if (isinstance(term, BinaryExpression) and term.operator is operators.eq
+                and isinstance(term.right, BindParameter)
+                and getattr(term.left, 'name', None) == pk.name
+                and getattr(getattr(term.left, 'table', None), 'name', None) == pk.table.name):
+            return term.right.effective_value
+    return None
+
+
+def install():
+    """Register the session listeners that feed subscribers (once per process)"""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    @event.listens_for(db.session, 'after_flush')
+    def record_flushed_objects(session, flush_context):
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if hasattr(obj, '__tablename__'):
+                _record(session, _object_change(obj))
+
+    @event.listens_for(db.session, 'do_orm_execute')
+    def record_bulk_statements(orm_execute_state):
+        if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None:
+            return
+        table = mapper.local_table
+        statement = orm_execute_state.statement
+        session = orm_execute_state.session
+
+        if orm_execute_state.is_insert:
+            # Inserts and upserts name their foreign keys in the VALUES clause
+            params = statement.compile(dialect=session.get_bind().dialect).params
+            values = {key: params[key] for key in TRACKED_KEYS if key in params}
+            _record(session, Change(table.name, params.get('id'), values))
+            return
+
+        row_id = _statement_id(statement, mapper.primary_key[0])
+        _record(session, Change(table.name, row_id, {}))
+
+    @event.listens_for(db.session, 'after_commit')
+    def publish_changes(session):
+        changes = session.info.pop('pending_changes', None)
+        if not changes:
+            return
+        for callback in _subscribers:
+            callback(changes)
+
+    @event.listens_for(db.session, 'after_rollback')
+    def discard_changes(session):
+        session.info.pop('pending_changes', None)
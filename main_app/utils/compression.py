@@ -0,0 +1,195 @@
+import gzip
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # br is only offered when Brotli is installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is only offered when zstandard is installed
+    zstandard = None
+
+# Text-like types worth compressing; images and archives already are
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+    'image/svg+xml',
+}
+
+
+class _Gzip:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self):
+        # wbits=31 writes the gzip header and trailer
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+class _Brotli:
+    name = 'br'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self):
+        compressor = brotli.Compressor(quality=self.level)
+        return compressor.process, compressor.flush, compressor.finish
+
+
+class _Zstd:
+    name = 'zstd'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        return (compressor.compress,
+                lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                compressor.flush)
+
+
+# Highest levels, for content compressed once and served many times
+MAX_LEVELS = {'gzip': 9, 'br': 11, 'zstd': 19}
+
+
+def available_codecs(app, max_level=False):
+    """
+    Installed codecs in the configured order of preference
+
+    Args:
+        max_level (bool): Use the slowest, smallest settings instead of the
+            configured levels, for precompressed content
+    """
+    def level(name, key):
+        return MAX_LEVELS[name] if max_level else app.config[key]
+
+    available = {
+        'gzip': _Gzip(level('gzip', 'COMPRESS_GZIP_LEVEL')),
+        'br': _Brotli(level('br', 'COMPRESS_BR_LEVEL')) if brotli is not None else None,
+        'zstd': _Zstd(level('zstd', 'COMPRESS_ZSTD_LEVEL')) if zstandard is not None else None,
+    }
+    names = [name.strip() for name in app.config['COMPRESS_ALGORITHMS'].split(',')]
+    return [available[name] for name in names if available.get(name)]
+
+
+def negotiate(codecs):
+    """
+    Pick the codec the client rates highest, breaking ties by our own order
+
+    Encodings with q=0 are refused and never picked.
+    """
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for codec in codecs:
+        quality = accepted.quality(codec.name)
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+def _log_ratio(logger, path, codec, size_in, size_out):
+    """Log the ratio a response was compressed with and return it"""
+    ratio = size_in / size_out if size_out else 0
+    logger.debug(f"Compressed {path} with {codec.name}: {size_in} -> {size_out} bytes ({ratio:.2f}x)")
+    return ratio
+
+
+def _stream(chunks, codec, on_finish):
+    """Compress a streamed body chunk by chunk, flushing after each one"""
+    compress, flush, finish = codec.stream()
+    size_in = size_out = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            size_in += len(chunk)
+            # Flush so each chunk reaches the client as soon as it is produced
+            out = compress(chunk) + flush()
+            size_out += len(out)
+            if out:
+                yield out
+        out = finish()
+        size_out += len(out)
+        if out:
+            yield out
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    on_finish(size_in, size_out)
+
+
+def init_compression(app):
+    """
+    Compress text responses with the best encoding the client accepts
+
+    Buffered bodies below COMPRESS_MIN_SIZE are left alone; streamed
+    (generator) bodies are compressed on the fly. The ratio achieved is sent
+    as X-Compression-Ratio on buffered responses and logged at debug level
+    for both.
+    """
+    codecs = available_codecs(app)
+    min_size = app.config['COMPRESS_MIN_SIZE']
+
+    @app.after_request
+    def compress_response(response):
+        if (not codecs or response.status_code < 200 or response.status_code in (204, 304)
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers
+                or response.direct_passthrough):
+            return response
+
+        # The body depends on Accept-Encoding even when left uncompressed
+        response.vary.add('Accept-Encoding')
+
+        if not response.is_streamed and response.content_length is not None \
+                and response.content_length < min_size:
+            return response
+
+        codec = negotiate(codecs)
+        if codec is None:
+            return response
+
+        if response.is_streamed:
+            # The stream is consumed after the request context is gone
+            path = request.path
+            response.response = _stream(
+                response.response, codec,
+                lambda size_in, size_out: _log_ratio(app.logger, path, codec, size_in, size_out)
+            )
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            compressed = codec.compress(data)
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+            ratio = _log_ratio(app.logger, request.path, codec, len(data), len(compressed))
+            response.headers['X-Compression-Ratio'] = f"{ratio:.2f}"
+
+        response.headers['Content-Encoding'] = codec.name
+        # A strong ETag identifies exact bytes, which differ per encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
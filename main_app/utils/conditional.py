@@ -0,0 +1,136 @@
+import hashlib
+from datetime import datetime, timezone
+from flask import after_this_request, current_app, g, jsonify, request
+from sqlalchemy import func, select
+from werkzeug.http import is_resource_modified, parse_etags
+from main_app.models import db
+
+
+def _aggregates(sources):
+    """
+    max(timestamp) and row count of every source, fetched in one query
+
+    Args:
+        sources: (query, column) pairs; query is an ORM Query or a Select
+            restricted to the rows the response is built from, column the
+            timestamp that moves whenever one of those rows changes
+    """
+    columns = []
+    for query, column in sources:
+        statement = getattr(query, 'statement', query).order_by(None)
+        columns.append(statement.with_only_columns(func.max(column)).scalar_subquery())
+        columns.append(statement.with_only_columns(func.count()).scalar_subquery())
+    return db.session.execute(select(*columns)).one()
+
+
+def version_etag(version):
+    """ETag of one row version, as sent back in If-Match (see check_if_match)"""
+    return f"v{version}"
+
+
+def check_if_match(version):
+    """
+    Refuse a mutation whose If-Match names another version of the row
+
+    Tags are compared by their part before the first '-', so both the tag
+    of a mutation response ("v3") and that of a detail GET ("v3-<hash>")
+    are accepted, weak or strong. Requests without If-Match, or with
+    If-Match: *, go ahead.
+
+    Args:
+        version (int): Current version of the row about to be changed
+
+    Returns:
+        Response: 409 response carrying the current ETag, or None when the
+            mutation may proceed
+    """
+    if_match = parse_etags(request.headers.get('If-Match'))
+    if not if_match or if_match.star_tag:
+        return None
+    current = version_etag(version)
+    if any(tag.split('-', 1)[0] == current for tag in if_match.as_set(include_weak=True)):
+        return None
+    return version_conflict(version)
+
+
+def version_conflict(version=None):
+    """409 response telling the client to reload the row and retry"""
+    response = jsonify({'error': 'This resource was changed by another request. Reload it and retry'})
+    response.status_code = 409
+    if version is not None:
+        response.set_etag(version_etag(version))
+    return response
+
+
+def versioned(response, version):
+    """Attach a row version's ETag to a mutation response (a view's (body, status) tuple)"""
+    response = current_app.make_response(response)
+    response.set_etag(version_etag(version))
+    return response
+
+
+def check_not_modified(*sources, identity=None, time_dependent=False, version=None):
+    """
+    Answer a conditional GET from validators instead of building the body
+
+    The ETag hashes the request URL, the caller and the max(updated_at) and
+    row count of every source; Last-Modified is the newest timestamp. When
+    the client's If-None-Match / If-Modified-Since still match, a 304 is
+    returned and the view skips its queries and serialization. Otherwise
+    the validators are attached to the view's 200 response.
+
+    Args:
+        *sources: (query, column) pairs, see _aggregates
+        identity: User the response is personalised for; makes the
+            response private to that user
+        time_dependent (bool): The body changes with the clock (e.g.
+            upcoming/active status), so validators also expire each minute
+        version: (query, version column) pair selecting the one row the
+            response represents; its version prefixes the ETag so the tag
+            can be sent back as If-Match
+
+    Returns:
+        Response: 304 response, or None when the view should build the body
+    """
+    values = list(_aggregates(sources + ((version,) if version else ())))
+    timestamps = [v for v in values[:2 * len(sources):2] if v is not None]
+    last_modified = max(timestamps).replace(tzinfo=timezone.utc, microsecond=0) if timestamps else None
+
+    key = [request.full_path, identity] + [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    if time_dependent:
+        key.append(datetime.utcnow().strftime('%Y-%m-%dT%H:%M'))
+        # Clock-driven changes do not move Last-Modified, so rely on the ETag
+        last_modified = None
+    etag = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    if version and values[-2] is not None:
+        etag = f"{version_etag(values[-2])}-{etag}"
+
+    g.validators = (etag, last_modified, identity is not None)
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        apply_validators(response)
+        return response
+
+    @after_this_request
+    def add_validators(response):
+        return apply_validators(response)
+
+    return None
+
+
+def apply_validators(response):
+    """Attach the validators computed by check_not_modified to a response"""
+    validators = g.get('validators')
+    if validators is None or response.status_code not in (200, 304):
+        return response
+    etag, last_modified, private = validators
+    # Weak: the same data may be sent with different encodings
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Clients may keep the body but must revalidate before reusing it
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    if private:
+        response.vary.add('Authorization')
+    return response
@@ -0,0 +1,98 @@
+import random
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from main_app.models import db
+
+
+def configure_sqlite(app):
+    """
+    Apply the SQLITE_* pragmas from the config to every new SQLite connection
+
+    WAL lets readers keep going while a writer commits, which is what stops
+    gunicorn workers from tripping over "database is locked" during booking
+    bursts. Does nothing when the app is not running on SQLite.
+
+    Args:
+        app (Flask): Application whose engine should be tuned
+    """
+    with app.app_context():
+        engine = db.engine
+
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = [
+        ('journal_mode', app.config['SQLITE_JOURNAL_MODE']),
+        ('synchronous', app.config['SQLITE_SYNCHRONOUS']),
+        ('mmap_size', app.config['SQLITE_MMAP_SIZE']),
+        ('cache_size', app.config['SQLITE_CACHE_SIZE']),
+        ('temp_store', app.config['SQLITE_TEMP_STORE']),
+        ('foreign_keys', 'ON' if app.config['SQLITE_FOREIGN_KEYS'] else 'OFF'),
+    ]
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def is_busy_error(error):
+    """Check if an OperationalError is SQLite reporting a locked or busy database"""
+    orig = getattr(error, 'orig', None)
+    if getattr(orig, 'sqlite_errorname', None) in ('SQLITE_BUSY', 'SQLITE_LOCKED'):
+        return True
+    message = str(orig or error).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def retry_on_busy(work):
+    """
+    Run a unit of work, retrying it with jittered backoff on SQLITE_BUSY
+
+    A failed commit rolls the whole transaction back, so the retry has to
+    re-run the changes as well as the commit: `work` should apply its changes
+    and commit, and must be safe to call again after a rollback.
+
+    Args:
+        work (callable): Function that performs the writes and commits
+
+    Returns:
+        Whatever `work` returns
+    """
+    retries = current_app.config.get('SQLITE_BUSY_RETRIES', 5)
+    backoff = current_app.config.get('SQLITE_BUSY_BACKOFF', 0.05)
+
+    for attempt in range(retries + 1):
+        try:
+            return work()
+        except OperationalError as e:
+            db.session.rollback()
+            if attempt == retries or not is_busy_error(e):
+                raise
+            delay = random.uniform(0, backoff * (2 ** attempt))
+            current_app.logger.warning(
+                f"Database busy, retrying in {delay * 1000:.0f}ms (attempt {attempt + 1}/{retries})"
+            )
+            time.sleep(delay)
+
+
+def lock_booking_slot(user_id, session_id):
+    """
+    Serialize concurrent writes for one user/session pair on PostgreSQL
+
+    Takes a transaction-scoped advisory lock, released automatically on
+    commit or rollback, so retried or double-submitted requests for the same
+    booking queue up instead of racing. SQLite already serializes writers,
+    so this is a no-op there.
+
+    Args:
+        user_id (int): ID of the booking user
+        session_id (int): ID of the booked session
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return
+    db.session.execute(db.select(db.func.pg_advisory_xact_lock(user_id, session_id)))
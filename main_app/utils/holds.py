@@ -0,0 +1,83 @@
+from collections import defaultdict
+from main_app.models import db
+from main_app.models.hold import SeatHold
+from main_app.models.session import Session
+from main_app.models.waitlist import Waitlist
+from main_app.utils.background import PeriodicThread
+from main_app.utils.database import retry_on_busy
+
+
+def release_hold(hold):
+    """Delete one hold and give its seat back (the caller commits)"""
+    deleted = db.session.execute(db.delete(SeatHold).where(SeatHold.id == hold.id)).rowcount
+    if deleted:
+        Session.release_holds(hold.session_id)
+    return deleted == 1
+
+
+def sweep_expired_holds(batch_size):
+    """
+    Release every expired hold, `batch_size` holds per transaction
+
+    Each batch is read off the expiry index, deleted per session, and the
+    freed seats are handed to the sessions' waitlists in the same
+    transaction. Safe to run from several workers at once: only holds a
+    worker actually deleted are subtracted from held_count.
+
+    Returns:
+        int: Number of holds released
+    """
+    from main_app.routes.booking_routes import send_promotion_notifications
+
+    released = 0
+    while True:
+        def sweep_batch():
+            rows = SeatHold.expired_batch(batch_size)
+            by_session = defaultdict(list)
+            for hold_id, session_id in rows:
+                by_session[session_id].append(hold_id)
+
+            freed, promoted = 0, []
+            for session_id, hold_ids in sorted(by_session.items()):
+                deleted = db.session.execute(
+                    db.delete(SeatHold).where(SeatHold.session_id == session_id, SeatHold.id.in_(hold_ids))
+                ).rowcount
+                if deleted:
+                    Session.release_holds(session_id, deleted)
+                    promoted.extend(Waitlist.promote(session_id))
+                freed += deleted
+            db.session.commit()
+            return len(rows), freed, promoted
+
+        found, freed, promoted = retry_on_busy(sweep_batch)
+        released += freed
+        send_promotion_notifications(promoted)
+        if found < batch_size:
+            return released
+
+
+class HoldSweeper(PeriodicThread):
+    """Background thread releasing expired seat holds every few seconds"""
+
+    name = 'hold-sweeper'
+
+    def interval(self, app):
+        return app.config['HOLD_SWEEP_INTERVAL']
+
+    def run_once(self, app):
+        released = sweep_expired_holds(app.config['HOLD_SWEEP_BATCH_SIZE'])
+        if released:
+            app.logger.info(f"Released {released} expired seat holds")
+
+
+hold_sweeper = HoldSweeper()
+
+
+def init_holds(app):
+    """Run the expired hold sweeper in every worker that serves requests"""
+    if app.config['HOLD_SWEEP_INTERVAL'] <= 0:
+        return
+
+    @app.before_request
+    def start_hold_sweeper():
+        hold_sweeper.ensure_started(app)
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, jsonify, request
+from sqlalchemy.exc import IntegrityError
+from main_app.models import db
+from main_app.models.idempotency import IdempotencyKey
+from main_app.utils.auth import current_user_id
+from main_app.utils.database import retry_on_busy
+
+HEADER = 'Idempotency-Key'
+
+# Response headers stored with the body and sent again on replay; the ETag
+# carries the row version a client needs for a later If-Match
+REPLAYED_HEADERS = ('ETag', 'Location')
+
+# An unfinished key older than this belongs to a request that died mid-way
+# (e.g. a killed worker) and may be claimed again
+ABANDONED_AFTER = timedelta(minutes=2)
+
+_purge_lock = threading.Lock()
+_last_purge = 0.0
+
+
+def _request_hash():
+    """Fingerprint of the request a key was first used with"""
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.path}\n".encode('utf-8'))
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _purge_if_due():
+    """Delete expired keys, at most once per IDEMPOTENCY_PURGE_INTERVAL per process"""
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge < current_app.config['IDEMPOTENCY_PURGE_INTERVAL']:
+        return
+    with _purge_lock:
+        if now - _last_purge < current_app.config['IDEMPOTENCY_PURGE_INTERVAL']:
+            return
+        _last_purge = now
+
+    def purge():
+        deleted = IdempotencyKey.purge_expired()
+        db.session.commit()
+        return deleted
+
+    try:
+        deleted = retry_on_busy(purge)
+        if deleted:
+            current_app.logger.info(f"Purged {deleted} expired idempotency keys")
+    except Exception as e:
+        # Purging is housekeeping; the request goes ahead regardless
+        db.session.rollback()
+        current_app.logger.error(f"Error purging idempotency keys: {str(e)}")
+
+
+def _claim(user_id, key, request_hash):
+    """
+    Record that a request with this key has started
+
+    Returns:
+        tuple: (IdempotencyKey row, True if this request claimed the key or
+            False if it was already used). The row is None when a concurrent
+            request claimed the key and has not committed it yet.
+    """
+    now = datetime.utcnow()
+
+    def claim():
+        existing = IdempotencyKey.query.filter_by(user_id=user_id, key=key).first()
+        if existing is not None:
+            abandoned = not existing.is_complete and existing.created_at < now - ABANDONED_AFTER
+            if existing.expires_at >= now and not abandoned:
+                return existing, False
+            # Expired but not purged yet, or left behind by a dead request
+            db.session.delete(existing)
+            db.session.flush()
+        record = IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(seconds=current_app.config['IDEMPOTENCY_KEY_TTL'])
+        )
+        db.session.add(record)
+        db.session.commit()
+        return record, True
+
+    try:
+        return retry_on_busy(claim)
+    except IntegrityError:
+        # A concurrent request claimed the key first
+        db.session.rollback()
+        return IdempotencyKey.query.filter_by(user_id=user_id, key=key).first(), False
+
+
+def _release(record):
+    """Forget an unfinished key so a retry runs the request again"""
+    try:
+        db.session.rollback()
+        db.session.delete(record)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error releasing idempotency key {record.key}: {str(e)}")
+
+
+def has_stored_response():
+    """
+    The request's Idempotency-Key already has a finished response to replay
+
+    Lets @admission_controlled wave retries of finished requests through
+    without spending a token on them.
+    """
+    key = (request.headers.get(HEADER) or '').strip()
+    if not key or len(key) > 255:
+        return False
+    record = IdempotencyKey.query.filter_by(user_id=current_user_id(), key=key).first()
+    return record is not None and record.is_complete and record.expires_at >= datetime.utcnow()
+
+
+def _replay(record):
+    """Stored response of a finished request, marked as a replay"""
+    response = current_app.response_class(record.response_body, status=record.status_code,
+                                          mimetype='application/json')
+    if record.response_headers:
+        response.headers.update(json.loads(record.response_headers))
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """
+    Make a mutation safe to retry with an Idempotency-Key header
+
+    The first request with a key runs the view and stores its status, body
+    and REPLAYED_HEADERS for IDEMPOTENCY_KEY_TTL seconds. Retries with the same key get the
+    stored response back without running the view, so bookings are not
+    touched and CRM notifications are not sent again. Server errors are not
+    stored, so the retry runs for real. Keys are scoped to the user and must
+    be used with the same method, path and body. Requests without the header
+    run as usual. Apply below @jwt_required().
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        key = key.strip()
+        if not key or len(key) > 255:
+            return jsonify({'error': f'{HEADER} must be 1 to 255 characters'}), 400
+
+        _purge_if_due()
+
+        user_id = current_user_id()
+        request_hash = _request_hash()
+        record, claimed = _claim(user_id, key, request_hash)
+        if not claimed:
+            if record is not None and record.request_hash != request_hash:
+                return jsonify({'error': f'{HEADER} was already used for a different request'}), 422
+            if record is None or not record.is_complete:
+                return jsonify({'error': 'A request with this Idempotency-Key is still being processed'}), 409
+            return _replay(record)
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            _release(record)
+            raise
+
+        if response.status_code >= 500:
+            _release(record)
+            return response
+
+        def store():
+            record.status_code = response.status_code
+            record.response_body = response.get_data(as_text=True)
+            record.response_headers = json.dumps({
+                name: response.headers[name] for name in REPLAYED_HEADERS if name in response.headers
+            })
+            db.session.commit()
+
+        try:
+            retry_on_busy(store)
+        except Exception as e:
+            # The mutation itself went through; only replay is lost
+            db.session.rollback()
+            current_app.logger.error(f"Error storing idempotent response for key {key}: {str(e)}")
+        return response
+    return wrapper
@@ -0,0 +1,80 @@
+import dataclasses
+import decimal
+from datetime import date, time
+from enum import Enum
+from uuid import UUID
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+
+def _default(o):
+    """Encode the values the serializers hand over that JSON has no type for"""
+    if isinstance(o, (date, time)):
+        return o.isoformat()
+    if isinstance(o, Enum):
+        return o.value
+    if isinstance(o, (decimal.Decimal, UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """
+    Standard library JSON provider that writes datetimes as ISO 8601
+
+    Flask's default provider writes datetimes as HTTP dates; the API has
+    always returned ISO 8601, so models can hand over raw datetimes and
+    enums instead of formatting every field themselves.
+    """
+
+    default = staticmethod(_default)
+
+    # Serializers already emit keys in a stable order; sorting every
+    # response only costs time
+    sort_keys = False
+
+
+class OrjsonProvider(IsoJSONProvider):
+    """
+    JSON provider backed by orjson
+
+    orjson encodes datetimes (ISO 8601, same output as isoformat()), enums,
+    UUIDs and dataclasses natively and writes bytes directly, which makes
+    large list responses several times cheaper to encode.
+    """
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # Keyword arguments are json.dumps options orjson does not understand
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# Provider installed by create_app
+AppJSONProvider = OrjsonProvider if orjson is not None else IsoJSONProvider
@@ -0,0 +1,70 @@
+from flask import current_app
+from sqlalchemy.orm import joinedload, raiseload
+from main_app.models.booking import Booking
+from main_app.models.session import Session
+
+
+def strict_loading_enabled():
+    """Check if unplanned lazy loads should raise instead of querying"""
+    return current_app.config.get('SQLALCHEMY_RAISE_ON_LAZY_LOAD', False)
+
+
+def eager(loader, *children):
+    """
+    Build an eager-loading option with optional child options
+
+    In strict mode every level also gets raiseload('*'), so touching a
+    relationship the endpoint did not plan for raises instead of quietly
+    issuing one query per row. Lookups answered from the identity map are
+    still allowed.
+
+    Args:
+        loader: Loader option such as joinedload(Booking.user)
+        *children: Options for relationships of the loaded entity
+
+    Returns:
+        Loader option
+    """
+    children = list(children)
+    if strict_loading_enabled():
+        children.append(raiseload('*', sql_only=True))
+    return loader.options(*children) if children else loader
+
+
+def with_loads(query, *options):
+    """
+    Apply an endpoint's eager-loading options to a query
+
+    Args:
+        query: Query whose rows will be serialized
+        *options: Options from booking_loads() / session_loads()
+
+    Returns:
+        Query with the options (and raiseload('*') in strict mode) applied
+    """
+    if strict_loading_enabled():
+        options = options + (raiseload('*', sql_only=True),)
+    return query.options(*options)
+
+
+def booking_loads():
+    """Loader options covering everything Booking.to_dict reads"""
+    return (
+        eager(joinedload(Booking.user)),
+        eager(joinedload(Booking.session), eager(joinedload(Session.parent_event))),
+    )
+
+
+def session_loads(facilitator_loader=joinedload):
+    """
+    Loader options covering everything Session.to_dict reads
+
+    Args:
+        facilitator_loader: selectinload when many rows share a facilitator
+            (e.g. the sessions of one event), joinedload otherwise
+    """
+    return (
+        eager(facilitator_loader(Session.facilitator)),
+        eager(joinedload(Session.parent_event)),
+    )
+
@@ -0,0 +1,153 @@
+import base64
+import json
+from datetime import datetime
+from flask import request
+from sqlalchemy import Select, and_, func, select, tuple_
+from main_app.models import db
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(values):
+    """
+    Encode the sort-key values of the last row on a page into an opaque cursor
+
+    Args:
+        values (list): Sort-key values, e.g. [start_date, id]
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_value(value):
+    """One sort-key value of a cursor payload; only what encode_cursor writes is accepted"""
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value['dt'])
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("cursor values must be numbers, strings or datetimes")
+    return value
+
+
+def decode_cursor(cursor, length=None):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor (str): Cursor string from the client
+        length (int): Number of sort-key values expected, if known
+
+    Returns:
+        list: Sort-key values
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or has the wrong shape
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list):
+            raise ValueError("cursor payload must be a list")
+        if length is not None and len(payload) != length:
+            raise ValueError("cursor has the wrong number of values")
+        return [_decode_value(v) for v in payload]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def _sort_value(row, column):
+    """Value of a sort column on a result row, looking inside the ORM entity of an entity-plus-columns row"""
+    if hasattr(row, column.key):
+        return getattr(row, column.key)
+    return getattr(row[0], column.key)
+
+
+def paginate_query(query, sort_columns, descending=True, default_per_page=10):
+    """
+    Paginate a list query by page number or by an opaque keyset cursor
+
+    Reads `page`, `per_page`, `cursor` and `include_total` from the request.
+    When `cursor` is present (an empty value means the first page) the query
+    seeks past the last row of the previous page on `sort_columns` instead of
+    using OFFSET, so deep pages cost the same as the first one. The total
+    count is a separate COUNT(*) query and is skipped with include_total=false.
+
+    Args:
+        query: Query to paginate, without an ORDER BY; either an ORM Query or
+            a read-only Select such as Session.list_select(), whose rows
+            are returned as-is
+        sort_columns (list): Non-nullable columns making up a unique sort key,
+            ending with the id; a NULL would drop its row from every page
+            after the first
+        descending (bool): Sort direction, applied to every sort column
+        default_per_page (int): Page size when the client does not send per_page
+
+    Returns:
+        tuple: (items, pagination dict for the response)
+
+    Raises:
+        InvalidCursor: If the cursor cannot be decoded
+    """
+    per_page = request.args.get('per_page', default_per_page, type=int)
+    if per_page is None or per_page < 1:
+        per_page = default_per_page
+    include_total = request.args.get('include_total', 'true').lower() != 'false'
+    cursor = request.args.get('cursor')
+
+    is_select = isinstance(query, Select)
+    total = None
+    if include_total:
+        if is_select:
+            total = db.session.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        else:
+            total = query.order_by(None).count()
+
+    order = [col.desc() if descending else col.asc() for col in sort_columns]
+    query = query.order_by(*order)
+
+    if cursor is not None:
+        if cursor:
+            values = decode_cursor(cursor, len(sort_columns))
+            # The leading-column bound is redundant with the row-value
+            # comparison but lets the database seek on an index
+            if descending:
+                seek = and_(sort_columns[0] <= values[0], tuple_(*sort_columns) < tuple_(*values))
+            else:
+                seek = and_(sort_columns[0] >= values[0], tuple_(*sort_columns) > tuple_(*values))
+            query = query.filter(seek)
+        page = None
+    else:
+        page = max(request.args.get('page', 1, type=int) or 1, 1)
+        query = query.offset((page - 1) * per_page)
+
+    # Fetch one extra row to learn whether there is a next page
+    query = query.limit(per_page + 1)
+    rows = db.session.execute(query).all() if is_select else query.all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+
+    next_cursor = None
+    if has_next and items:
+        last = items[-1]
+        next_cursor = encode_cursor([_sort_value(last, col) for col in sort_columns])
+
+    pagination = {
+        'per_page': per_page,
+        'total': total,
+        'has_next': has_next,
+        'next_cursor': next_cursor
+    }
+    if page is not None:
+        pagination.update({
+            'page': page,
+            'pages': -(-total // per_page) if total is not None and per_page > 0 else None,
+            'has_prev': page > 1
+        })
+
+    return items, pagination
+
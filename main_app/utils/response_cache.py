@@ -0,0 +1,116 @@
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, g, request
+from main_app.utils import changes
+from main_app.utils.cache import TaggedLRUCache
+from main_app.utils.conditional import apply_validators
+
+# Cached bodies of the public catalog GET endpoints
+response_cache = TaggedLRUCache()
+
+_subscribed = False
+
+
+def init_response_cache(app):
+    """
+    Size the response cache from the config and evict entries on commits
+
+    Every committed change to an event, session or booking drops the
+    cached responses that show it, via the change feed in
+    main_app/utils/changes.py. Each worker process has its own cache, so a
+    write handled by another worker is only picked up after the TTL.
+    """
+    response_cache.max_entries = app.config['RESPONSE_CACHE_SIZE']
+    response_cache.ttl = app.config['RESPONSE_CACHE_TTL']
+    response_cache.clear()
+
+    global _subscribed
+    changes.install()
+    if not _subscribed:
+        changes.subscribe(invalidate_changes)
+        _subscribed = True
+
+
+def _tags_for(change):
+    """Tags of the cached responses a change affects, or None for all of them"""
+    if change.table == 'events':
+        if change.id is None:
+            return None
+        # Session lists and details show the event title
+        return ['events', 'sessions', f'event:{change.id}']
+    if change.table == 'sessions':
+        if change.id is None:
+            return None
+        tags = ['events', 'sessions', f'session:{change.id}']
+        if change.values.get('event_id'):
+            tags.append(f"event:{change.values['event_id']}")
+        return tags
+    if change.table == 'bookings':
+        # Bookings show up as session booked counts and event booking totals
+        session_id = change.values.get('session_id')
+        if session_id is None:
+            return None
+        return ['events', 'sessions', f'session:{session_id}']
+    return []
+
+
+def invalidate_changes(committed):
+    """Change feed subscriber evicting the responses affected by a commit"""
+    tags = set()
+    for change in committed:
+        change_tags = _tags_for(change)
+        if change_tags is None:
+            response_cache.clear()
+            return
+        tags.update(change_tags)
+    if tags:
+        response_cache.invalidate_tags(tags)
+
+
+def tag_response(*tags):
+    """Attach extra invalidation tags to the response being cached"""
+    cache_tags = g.get('cache_tags')
+    if cache_tags is not None:
+        cache_tags.update(tags)
+
+
+def _cache_key():
+    """Request path plus its query args in a canonical order"""
+    args = sorted(request.args.items(multi=True))
+    return f"{request.path}?{urlencode(args)}"
+
+
+def cached_response(*tags):
+    """
+    Cache a public GET endpoint's successful responses
+
+    Args:
+        *tags: Invalidation tags, formatted with the view arguments, e.g.
+            'event:{event_id}'. Views can add more with tag_response().
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not response_cache.enabled:
+                return view(*args, **kwargs)
+
+            key = _cache_key()
+            hit = response_cache.get(key)
+            if hit is not None:
+                body, mimetype, headers = hit
+                response = current_app.response_class(body, status=200, mimetype=mimetype, headers=headers)
+                # Entries are evicted on commit, so their validators are current
+                return response.make_conditional(request)
+
+            # Anything invalidated while the view runs makes its result stale
+            generation = response_cache.generation
+            g.cache_tags = {tag.format(**kwargs) for tag in tags}
+            response = apply_validators(current_app.make_response(view(*args, **kwargs)))
+            if response.status_code == 200 and not response.direct_passthrough:
+                headers = {name: response.headers[name]
+                           for name in ('ETag', 'Last-Modified', 'Cache-Control') if name in response.headers}
+                response_cache.set(key, (response.get_data(), response.mimetype, headers),
+                                   g.cache_tags, generation=generation)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,92 @@
+import re
+from sqlalchemy import bindparam, column, func, literal_column, or_, select, table, text
+from main_app.models import db
+
+# FTS5 index over each searchable table, created by migration b7d2e5f8a310
+FTS_TABLES = {
+    'events': 'events_fts',
+    'sessions': 'sessions_fts',
+}
+
+# bm25 column weights; a hit in an event title counts more than one in its description
+FTS_WEIGHTS = {
+    'events_fts': (10.0, 1.0),
+    'sessions_fts': (1.0,),
+}
+
+# Engine URL and FTS table -> whether the table exists, checked once per process
+_available = {}
+
+
+def fts_available(fts_table):
+    """
+    Check whether an FTS5 table exists in the current database
+
+    False on every backend other than SQLite, and on SQLite databases built
+    with db.create_all() rather than the migrations.
+    """
+    engine = db.engine
+    key = (str(engine.url), fts_table)
+    if key not in _available:
+        available = False
+        if engine.dialect.name == 'sqlite':
+            available = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': fts_table}
+            ).first() is not None
+        _available[key] = available
+    return _available[key]
+
+
+def fts_query(term):
+    """
+    Turn free text into an FTS5 query matching every word as a prefix
+
+    Words are quoted, so FTS5 operators and punctuation typed by the client
+    are searched for literally instead of being parsed.
+
+    Returns:
+        str: MATCH expression, or None when the term holds no words
+    """
+    words = re.findall(r'\w+', term)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def apply_search(query, model, columns, term):
+    """
+    Restrict a list query to rows matching a search term
+
+    Uses the model's FTS5 table when there is one, joining the bm25 score in
+    as a `search_rank` result column (lower is more relevant). Otherwise
+    falls back to a case-insensitive substring match on `columns`.
+
+    Args:
+        query: ORM Query or Select over `model`
+        model: Mapped class whose table is searched
+        columns (list): Columns the LIKE fallback matches against; the FTS
+            table indexes the same ones
+        term (str): Search text from the client
+
+    Returns:
+        tuple: (query, rank column to sort by, or None for the LIKE fallback)
+    """
+    fts_table = FTS_TABLES.get(model.__tablename__)
+    match = fts_query(term)
+    if fts_table is None or match is None or not fts_available(fts_table):
+        like = f"%{term}%"
+        return query.filter(or_(*[col.ilike(like) for col in columns])), None
+
+    fts = table(fts_table, column('rowid'))
+    ranked = (
+        select(
+            fts.c.rowid.label('id'),
+            func.bm25(literal_column(fts_table), *FTS_WEIGHTS[fts_table]).label('search_rank')
+        )
+        .select_from(fts)
+        .where(literal_column(fts_table).op('MATCH')(bindparam('search_match', match)))
+        .subquery('search')
+    )
+    query = query.join(ranked, ranked.c.id == model.id).add_columns(ranked.c.search_rank)
+    return query, ranked.c.search_rank
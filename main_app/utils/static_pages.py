@@ -0,0 +1,102 @@
+import hashlib
+import os
+import threading
+from flask import current_app, request
+from main_app.utils.compression import available_codecs, negotiate
+
+# Repository root, where the HTML pages live
+PAGES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class StaticPage:
+    """One HTML page held in memory with its precompressed variants"""
+
+    def __init__(self, path, codecs):
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.path = path
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.fingerprint = self.digest[:12]
+        self.last_modified = stat.st_mtime
+        # Encoding name -> bytes; None is the identity body
+        self.variants = {None: body}
+        for codec in codecs:
+            compressed = codec.compress(body)
+            if len(compressed) < len(body):
+                self.variants[codec.name] = compressed
+
+    def etag(self, encoding):
+        """Strong ETag of one variant; each encoding is a different byte sequence"""
+        return f"{self.digest[:32]}-{encoding}" if encoding else self.digest[:32]
+
+
+class StaticPageRegistry:
+    """
+    HTML pages served from memory, reloaded only when their file changes
+
+    Each request costs one stat() of the file; the body, its compressed
+    variants and its ETag are rebuilt only when the mtime or size moved.
+    """
+
+    def __init__(self):
+        self._paths = {}
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, filename, directory=PAGES_DIR):
+        """Make `filename` servable under `name`; the file is read on first use"""
+        self._paths[name] = os.path.join(directory, filename)
+
+    def get(self, name):
+        """
+        Current version of a page
+
+        Raises:
+            KeyError: The page was never registered
+            FileNotFoundError: The file is missing
+        """
+        path = self._paths[name]
+        stat = os.stat(path)
+        page = self._pages.get(name)
+        if page is not None and page.signature == (stat.st_mtime_ns, stat.st_size):
+            return page
+        with self._lock:
+            page = self._pages.get(name)
+            if page is None or page.signature != (stat.st_mtime_ns, stat.st_size):
+                page = StaticPage(path, available_codecs(current_app, max_level=True))
+                self._pages[name] = page
+                current_app.logger.debug(f"Loaded static page {name} ({page.fingerprint})")
+            return page
+
+    def clear(self):
+        """Forget every loaded page so the next request reads it again"""
+        with self._lock:
+            self._pages.clear()
+
+    def serve(self, name):
+        """
+        Response for a page in the best precompressed encoding the client accepts
+
+        Clients must revalidate, but are answered with 304 while the strong
+        ETag still matches.
+        """
+        page = self.get(name)
+        codecs = [codec for codec in available_codecs(current_app) if codec.name in page.variants]
+        codec = negotiate(codecs)
+        encoding = codec.name if codec else None
+
+        response = current_app.response_class(page.variants[encoding], mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(page.etag(encoding))
+        response.last_modified = page.last_modified
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+
+static_pages = StaticPageRegistry()
+static_pages.register('index', 'index.html')
+static_pages.register('user_dashboard', 'user_dashboard.html')
+static_pages.register('facilitator_dashboard', 'facilitator_dashboard.html')
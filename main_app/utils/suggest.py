@@ -0,0 +1,270 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from sqlalchemy import select
+from main_app.models import db
+from main_app.models.event import Event
+from main_app.models.session import Session
+from main_app.models.user import User
+from main_app.utils import changes
+from main_app.utils.background import PeriodicThread
+
+# Suggestion kind -> (table it comes from, statement loading (id, text) rows)
+SOURCES = {
+    'event': ('events', lambda: select(Event.id, Event.title)),
+    'location': ('sessions', lambda: select(Session.id, Session.location)),
+    'facilitator': ('users', lambda: select(User.id, User.name).where(User.role == 'facilitator')),
+}
+
+# Entries looked at per lookup, so a one-letter prefix stays cheap
+MAX_SCAN = 128
+
+_subscribed = False
+
+
+def normalize(text):
+    """Lower-case, accent-free words of a text joined by single spaces"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(re.findall(r'\w+', stripped.casefold()))
+
+
+class PrefixIndex:
+    """
+    Sorted in-memory index answering "which texts have a word starting with
+    this prefix"
+
+    Every distinct text is stored once per word, keyed by the normalized
+    text from that word on, so "Main Conference Hall" is found by "main",
+    "conf" and "hall". Locations shared by several sessions are one text
+    with a reference count, so popular locations do not crowd the index.
+    Lookups bisect to the first key at or after the prefix and walk forward
+    while keys still start with it. Changes are applied per row.
+    """
+
+    def __init__(self):
+        self._entries = []  # (key, word position, kind, text id), sorted
+        self._rows = {}  # (kind, row id) -> text id
+        self._texts = {}  # (kind, text id) -> [row count, original text, normalized text]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    @staticmethod
+    def _text_id(kind, row_id, normalized):
+        """Locations are indexed by their text, everything else by row"""
+        return normalized if kind == 'location' else row_id
+
+    @staticmethod
+    def _keys(kind, text_id, normalized):
+        words = normalized.split(' ')
+        return [(' '.join(words[i:]), i, kind, text_id) for i in range(len(words)) if words[i]]
+
+    def _add(self, kind, row_id, text, normalized):
+        """Count a row's text; returns the new entries when the text is new"""
+        text_id = self._text_id(kind, row_id, normalized)
+        self._rows[(kind, row_id)] = text_id
+        stored = self._texts.get((kind, text_id))
+        if stored is not None:
+            stored[0] += 1
+            return []
+        self._texts[(kind, text_id)] = [1, text, normalized]
+        return self._keys(kind, text_id, normalized)
+
+    def _remove(self, kind, row_id):
+        text_id = self._rows.pop((kind, row_id), None)
+        if text_id is None:
+            return
+        stored = self._texts[(kind, text_id)]
+        stored[0] -= 1
+        if stored[0]:
+            return
+        del self._texts[(kind, text_id)]
+        for key in self._keys(kind, text_id, stored[2]):
+            i = bisect_left(self._entries, key)
+            if i < len(self._entries) and self._entries[i] == key:
+                del self._entries[i]
+
+    def replace(self, kind, rows, ids=None):
+        """
+        Load (id, text) rows of one kind
+
+        Args:
+            kind (str): Suggestion kind, a key of SOURCES
+            rows: (id, text) pairs now current
+            ids: Ids that were refreshed; any of them missing from rows is
+                dropped. None replaces every entry of the kind.
+        """
+        rows = [(row_id, text, normalize(text)) for row_id, text in rows]
+        with self._lock:
+            if ids is None:
+                # Full reload: re-sort once instead of inserting row by row
+                self._rows = {key: value for key, value in self._rows.items() if key[0] != kind}
+                self._texts = {key: value for key, value in self._texts.items() if key[0] != kind}
+                entries = [entry for entry in self._entries if entry[2] != kind]
+                for row_id, text, normalized in rows:
+                    entries.extend(self._add(kind, row_id, text, normalized))
+                entries.sort()
+                self._entries = entries
+                return
+            for row_id in ids:
+                self._remove(kind, row_id)
+            for row_id, text, normalized in rows:
+                self._remove(kind, row_id)
+                for entry in self._add(kind, row_id, text, normalized):
+                    insort(self._entries, entry)
+
+    def lookup(self, prefix, limit, kinds=None):
+        """
+        Best `limit` texts with a word starting with `prefix`
+
+        Matches at the start of a text rank first, then shorter texts. At
+        most MAX_SCAN distinct texts are looked at, so a text matching on
+        several words still counts once.
+
+        Returns:
+            list: {'type', 'text'} dicts, plus 'id' for events and facilitators
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        seen, matches = set(), {}
+        with self._lock:
+            entries, texts = self._entries, self._texts
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and len(seen) < MAX_SCAN:
+                key, position, kind, text_id = entries[i]
+                i += 1
+                if not key.startswith(prefix):
+                    break
+                seen.add((kind, text_id))
+                if kinds is not None and kind not in kinds:
+                    continue
+                _, text, normalized = texts[(kind, text_id)]
+                rank = (position, len(text), normalized)
+                if (kind, text_id) not in matches or rank < matches[(kind, text_id)][0]:
+                    matches[(kind, text_id)] = (rank, kind, text_id, text)
+
+        best = sorted(matches.values())[:limit]
+        return [
+            {'type': kind, 'text': text} if kind == 'location' else {'type': kind, 'id': text_id, 'text': text}
+            for _, kind, text_id, text in best
+        ]
+
+
+class SuggestIndex(PrefixIndex):
+    """
+    PrefixIndex over event titles, session locations and facilitator names
+
+    Built on first use. Committed changes to events, sessions and users
+    queue the affected ids via the change feed, and the next lookup reloads
+    just those rows. Commits made by other worker processes are picked up
+    by a full rebuild every `rebuild_interval` seconds, which runs on a
+    background thread (see SuggestRebuilder) rather than in a request.
+    """
+
+    def __init__(self, rebuild_interval=300):
+        super().__init__()
+        self.rebuild_interval = rebuild_interval
+        self._built = False
+        self._pending = {}  # table -> set of ids, or None for every row
+        self._pending_lock = threading.Lock()
+        # Held while rows are read and applied, so a rebuild cannot overwrite
+        # a newer per-row reload with its older snapshot
+        self._reload_lock = threading.Lock()
+
+    def mark_changed(self, committed):
+        """Change feed subscriber queueing the rows a commit touched"""
+        tables = {table for table, _ in SOURCES.values()}
+        with self._pending_lock:
+            for change in committed:
+                if change.table not in tables:
+                    continue
+                if change.id is None:
+                    self._pending[change.table] = None
+                elif self._pending.get(change.table, set()) is not None:
+                    self._pending.setdefault(change.table, set()).add(change.id)
+
+    def clear(self):
+        """Drop everything so the next lookup rebuilds from the database"""
+        with self._pending_lock:
+            self._pending.clear()
+            self._built = False
+
+    def _reload(self, pending):
+        for kind, (table, statement) in SOURCES.items():
+            if table not in pending:
+                continue
+            ids = pending[table]
+            stmt = statement()
+            if ids is not None:
+                ids = list(ids)
+                stmt = stmt.where(stmt.selected_columns[0].in_(ids))
+            self.replace(kind, db.session.execute(stmt).all(), ids)
+
+    def rebuild(self):
+        """Reload every row; changes committed while it reads stay queued"""
+        with self._reload_lock:
+            with self._pending_lock:
+                self._pending = {}
+                self._built = True
+            self._reload({table: None for table, _ in SOURCES.values()})
+
+    def refresh(self):
+        """
+        Build on first use, otherwise reload the rows changed since the last lookup
+
+        While a background rebuild is running the queued rows are left for
+        the next lookup instead of waiting for it.
+        """
+        if not self._built:
+            self.rebuild()
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            self._reload(pending)
+        finally:
+            self._reload_lock.release()
+
+    def suggest(self, prefix, limit, kinds=None):
+        """Refresh, then look up `prefix` (see PrefixIndex.lookup)"""
+        self.refresh()
+        return self.lookup(prefix, limit, kinds)
+
+
+class SuggestRebuilder(PeriodicThread):
+    """Background thread rebuilding the suggest index every rebuild_interval seconds"""
+
+    name = 'suggest-rebuilder'
+
+    def interval(self, app):
+        return suggest_index.rebuild_interval
+
+    def run_once(self, app):
+        suggest_index.rebuild()
+
+
+suggest_index = SuggestIndex()
+suggest_rebuilder = SuggestRebuilder()
+
+
+def init_suggest(app):
+    """Configure the typeahead index and feed it committed changes"""
+    global _subscribed
+    suggest_index.rebuild_interval = app.config['SUGGEST_REBUILD_INTERVAL']
+    suggest_index.clear()
+    changes.install()
+    if not _subscribed:
+        changes.subscribe(suggest_index.mark_changed)
+        _subscribed = True
+    if suggest_index.rebuild_interval <= 0:
+        return
+
+    @app.before_request
+    def start_suggest_rebuilder():
+        suggest_rebuilder.ensure_started(app)
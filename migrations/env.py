@@ -97,6 +97,17 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # batch_alter_table rebuilds SQLite tables by copying and dropping
+        # them, which fails while the foreign_keys pragma (see
+        # configure_sqlite) protects tables other tables reference. The
+        # pragma cannot change inside a transaction, so switch it off
+        # before the migrations start and check the constraints after.
+        sqlite_foreign_keys = None
+        if connection.dialect.name == 'sqlite':
+            sqlite_foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -106,6 +117,12 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+        if sqlite_foreign_keys is not None:
+            for table, rowid, parent, _ in connection.exec_driver_sql('PRAGMA foreign_key_check'):
+                logger.warning(f'Row {rowid} of {table} references a missing {parent} row')
+            connection.exec_driver_sql(f'PRAGMA foreign_keys={sqlite_foreign_keys}')
+            connection.commit()
+
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,35 @@
+"""Add capacity and booked_count to sessions
+
+Revision ID: 5e9b0a6d4c12
+Revises: c47e2f9b1d03
+Create Date: 2026-10-18 11:26:57.804132
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b0a6d4c12'
+down_revision = 'c47e2f9b1d03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('capacity', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('booked_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill the counter from the bookings that already exist
+    op.execute(
+        "UPDATE sessions SET booked_count = ("
+        "SELECT COUNT(*) FROM bookings "
+        "WHERE bookings.session_id = sessions.id AND bookings.status = 'booked')"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.drop_column('booked_count')
+        batch_op.drop_column('capacity')
@@ -0,0 +1,44 @@
+"""Add composite indexes for booking, session and event lookups
+
+Revision ID: 8a3d5c71e2b9
+Revises: f1c8b86c34e4
+Create Date: 2026-10-18 09:12:04.518213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a3d5c71e2b9'
+down_revision = 'f1c8b86c34e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_user_session_status', ['user_id', 'session_id', 'status'], unique=False)
+        batch_op.create_index('ix_bookings_session_status', ['session_id', 'status'], unique=False)
+        batch_op.create_index('ix_bookings_user_timestamp', ['user_id', 'timestamp'], unique=False)
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.create_index('ix_sessions_facilitator_time', ['facilitator_id', 'time'], unique=False)
+        batch_op.create_index('ix_sessions_event_time', ['event_id', 'time'], unique=False)
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_start_end', ['start_date', 'end_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_start_end')
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.drop_index('ix_sessions_event_time')
+        batch_op.drop_index('ix_sessions_facilitator_time')
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_user_timestamp')
+        batch_op.drop_index('ix_bookings_session_status')
+        batch_op.drop_index('ix_bookings_user_session_status')
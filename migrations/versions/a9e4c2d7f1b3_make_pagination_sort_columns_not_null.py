@@ -0,0 +1,37 @@
+"""Make pagination sort columns not null
+
+Revision ID: a9e4c2d7f1b3
+Revises: f6c3a8e1b4d9
+Create Date: 2026-10-18 21:12:40.318527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9e4c2d7f1b3'
+down_revision = 'f6c3a8e1b4d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination seeks on (timestamp, id) and (created_at, id); rows
+    # with a NULL there would drop out of every page after the first
+    op.execute("UPDATE bookings SET timestamp = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE timestamp IS NULL")
+    op.execute("UPDATE users SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=True)
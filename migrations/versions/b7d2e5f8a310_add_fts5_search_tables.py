@@ -0,0 +1,82 @@
+"""Add FTS5 search tables for events and sessions
+
+Revision ID: b7d2e5f8a310
+Revises: 5e9b0a6d4c12
+Create Date: 2026-10-18 14:20:11.508316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e5f8a310'
+down_revision = '5e9b0a6d4c12'
+branch_labels = None
+depends_on = None
+
+
+# External-content FTS5 tables: the text stays in events/sessions and the
+# triggers keep the index in step with every insert, update and delete.
+# Updates only re-index when an indexed column changes, so booked_count
+# bumps on sessions cost nothing extra.
+STATEMENTS = [
+    """CREATE VIRTUAL TABLE events_fts USING fts5(
+        title, description,
+        content='events', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER events_fts_au AFTER UPDATE OF title, description ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO events_fts(events_fts) VALUES ('rebuild')",
+
+    """CREATE VIRTUAL TABLE sessions_fts USING fts5(
+        location,
+        content='sessions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER sessions_fts_ai AFTER INSERT ON sessions BEGIN
+        INSERT INTO sessions_fts(rowid, location) VALUES (new.id, new.location);
+    END""",
+    """CREATE TRIGGER sessions_fts_ad AFTER DELETE ON sessions BEGIN
+        INSERT INTO sessions_fts(sessions_fts, rowid, location) VALUES ('delete', old.id, old.location);
+    END""",
+    """CREATE TRIGGER sessions_fts_au AFTER UPDATE OF location ON sessions BEGIN
+        INSERT INTO sessions_fts(sessions_fts, rowid, location) VALUES ('delete', old.id, old.location);
+        INSERT INTO sessions_fts(rowid, location) VALUES (new.id, new.location);
+    END""",
+    "INSERT INTO sessions_fts(sessions_fts) VALUES ('rebuild')",
+]
+
+
+def fts5_supported():
+    """FTS5 is SQLite-only and optional at SQLite build time; searches fall back to LIKE without it"""
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return False
+    return bool(bind.execute(sa.text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar())
+
+
+def upgrade():
+    if not fts5_supported():
+        return
+    for statement in STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name in ('events_fts_ai', 'events_fts_ad', 'events_fts_au',
+                 'sessions_fts_ai', 'sessions_fts_ad', 'sessions_fts_au'):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS events_fts")
+    op.execute("DROP TABLE IF EXISTS sessions_fts")
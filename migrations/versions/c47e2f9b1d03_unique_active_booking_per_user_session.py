@@ -0,0 +1,28 @@
+"""Enforce one active booking per user and session
+
+Revision ID: c47e2f9b1d03
+Revises: 8a3d5c71e2b9
+Create Date: 2026-10-18 10:03:41.227905
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e2f9b1d03'
+down_revision = '8a3d5c71e2b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('uq_bookings_active_user_session', ['user_id', 'session_id'], unique=True,
+                              sqlite_where=sa.text("status = 'booked'"),
+                              postgresql_where=sa.text("status = 'booked'"))
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('uq_bookings_active_user_session')
@@ -0,0 +1,26 @@
+"""Add response_headers to idempotency_keys
+
+Revision ID: c5b8e3f2a7d1
+Revises: a9e4c2d7f1b3
+Create Date: 2026-10-18 23:04:51.602114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5b8e3f2a7d1'
+down_revision = 'a9e4c2d7f1b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('response_headers', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.drop_column('response_headers')
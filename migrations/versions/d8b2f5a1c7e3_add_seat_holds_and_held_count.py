@@ -0,0 +1,45 @@
+"""Add seat_holds table and held_count to sessions
+
+Revision ID: d8b2f5a1c7e3
+Revises: a4f1d7c9e2b6
+Create Date: 2026-10-18 18:21:40.036917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b2f5a1c7e3'
+down_revision = 'a4f1d7c9e2b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('seat_holds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'session_id', name='uq_seat_holds_user_session')
+    )
+    with op.batch_alter_table('seat_holds', schema=None) as batch_op:
+        batch_op.create_index('ix_seat_holds_expires_at', ['expires_at'], unique=False)
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('held_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.drop_column('held_count')
+
+    with op.batch_alter_table('seat_holds', schema=None) as batch_op:
+        batch_op.drop_index('ix_seat_holds_expires_at')
+
+    op.drop_table('seat_holds')
@@ -18,7 +18,6 @@ depends_on = None
 
 def upgrade():
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_table('user')
     with op.batch_alter_table('users', schema=None) as batch_op:
         batch_op.add_column(sa.Column('role', sa.String(length=20), nullable=True))
 
@@ -30,13 +29,4 @@ def downgrade():
     with op.batch_alter_table('users', schema=None) as batch_op:
         batch_op.drop_column('role')
 
-    op.create_table('user',
-    sa.Column('id', sa.INTEGER(), nullable=False),
-    sa.Column('name', sa.VARCHAR(length=50), nullable=False),
-    sa.Column('email', sa.VARCHAR(length=100), nullable=False),
-    sa.Column('password', sa.VARCHAR(length=100), nullable=False),
-    sa.Column('created_at', sa.DATETIME(), nullable=True),
-    sa.PrimaryKeyConstraint('id'),
-    sa.UniqueConstraint('email')
-    )
     # ### end Alembic commands ###
@@ -0,0 +1,32 @@
+"""Add version to sessions and bookings
+
+Revision ID: f6c3a8e1b4d9
+Revises: d8b2f5a1c7e3
+Create Date: 2026-10-18 19:38:02.715064
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6c3a8e1b4d9'
+down_revision = 'd8b2f5a1c7e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.drop_column('version')